@@ -0,0 +1,144 @@
+"""Paridad y rendimiento del motor NumPy (``core.engine``) contra ``ta``.
+
+Primero verifica que los seis indicadores coincidan con ``ta`` dentro de la
+tolerancia (incluidas series cortas y columnas con historia más corta) y
+termina con error si alguno difiere; ``tests/test_indicators.py`` cubre
+lo mismo (y el cálculo barra a barra) con pytest. Después mide tiempo y pico de memoria
+(tracemalloc) de ambos caminos, y el panel de varios tickers
+(``core.indicators.compute_panel``) contra un ticker por vez::
+
+    python benchmarks/bench_indicators.py --rows 100000 1000000 --tickers 500
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import ta
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from core.indicators import add_technical_indicators, build_panel, compute_panel  # noqa: E402
+from core.providers import synthetic_ohlcv  # noqa: E402
+
+RTOL = 1e-7
+
+
+def with_ta(data):
+    close = data['Close']
+    macd = ta.trend.MACD(close)
+    boll = ta.volatility.BollingerBands(close, window=20, window_dev=2)
+    stoch = ta.momentum.StochasticOscillator(data['High'], data['Low'], close,
+                                             window=14, smooth_window=3)
+    return {
+        'SMA_20': ta.trend.sma_indicator(close, window=20),
+        'EMA_20': ta.trend.ema_indicator(close, window=20),
+        'RSI_14': ta.momentum.rsi(close, window=14),
+        'MACD': macd.macd(),
+        'MACD_Signal': macd.macd_signal(),
+        'MACD_Hist': macd.macd_diff(),
+        'BB_High': boll.bollinger_hband(),
+        'BB_Low': boll.bollinger_lband(),
+        'Stoch_%K': stoch.stoch(),
+        'Stoch_%D': stoch.stoch_signal(),
+    }
+
+
+def with_engine(data):
+    """Indicadores por el mismo camino que la página (registro de ``core.indicators``)."""
+    return add_technical_indicators(data[['High', 'Low', 'Close']].copy())
+
+
+def compare(label, expected, actual):
+    failures = []
+    for column, reference in expected.items():
+        reference = np.asarray(reference, dtype=float)
+        values = np.asarray(actual[column], dtype=float)
+        if not (np.isnan(reference) == np.isnan(values)).all():
+            failures.append(f"{label} {column}: NaN en posiciones distintas")
+        elif not np.allclose(values, reference, rtol=RTOL, atol=1e-9, equal_nan=True):
+            error = np.nanmax(np.abs(values - reference) / np.maximum(np.abs(reference), 1e-9))
+            failures.append(f"{label} {column}: error relativo {error:.2e}")
+    return failures
+
+
+def check_parity():
+    failures = []
+    for rows in (1, 5, 20, 40, 3_000, 200_000):
+        data = synthetic_ohlcv(rows, seed=rows)
+        failures += compare(f"{rows} filas", with_ta(data), with_engine(data))
+
+    # Panel (fechas x tickers): la segunda columna empieza 300 barras después
+    data = synthetic_ohlcv(1_000, seed=7)
+    late = data.iloc[300:]
+    panel = data.copy()
+    panel.iloc[:300] = np.nan
+    stacked = {column: np.column_stack([data[column], panel[column]])
+               for column in ('High', 'Low', 'Close')}
+    both = compute_panel(stacked)
+    failures += compare('panel col 0', with_ta(data),
+                        {column: values[:, 0] for column, values in both.items()})
+    failures += compare('panel col 1', with_ta(late),
+                        {column: values[300:, 1] for column, values in both.items()})
+    if any(not np.isnan(values[:300, 1]).all() for values in both.values()):
+        failures.append('panel col 1: valores antes del inicio de la historia')
+    return failures
+
+
+def measure(function, data, repeat):
+    function(data)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(data)
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    function(data)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return min(times), peak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--tickers', type=int, default=500,
+                        help='tickers del panel (2500 barras cada uno)')
+    args = parser.parse_args(argv)
+
+    failures = check_parity()
+    if failures:
+        print('Paridad con ta: FALLA')
+        for failure in failures:
+            print('  ' + failure)
+        sys.exit(1)
+    print(f'Paridad con ta: OK (rtol={RTOL:g})')
+
+    print(f"{'filas':>9} {'camino':<8} {'ms':>9} {'pico MB':>9}")
+    for rows in args.rows:
+        data = synthetic_ohlcv(rows)
+        for label, function in (('ta', with_ta), ('numpy', with_engine)):
+            seconds, peak = measure(function, data, args.repeat)
+            print(f"{rows:>9} {label:<8} {seconds * 1000:>9.1f} {peak / 2**20:>9.1f}")
+
+    # Universo: historias de distinto largo, alineadas en un panel
+    histories = {f'T{i}': synthetic_ohlcv(2_500, seed=i).iloc[i % 250:]
+                 for i in range(args.tickers)}
+    _, _, panel = build_panel(histories)
+
+    def one_by_one(_):
+        return [add_technical_indicators(data[['High', 'Low', 'Close']].copy())
+                for data in histories.values()]
+
+    print(f"\n{'tickers':>9} {'camino':<10} {'ms':>9} {'pico MB':>9}")
+    for label, function in (('uno-a-uno', one_by_one), ('panel', compute_panel)):
+        seconds, peak = measure(function, panel, args.repeat)
+        print(f"{args.tickers:>9} {label:<10} {seconds * 1000:>9.1f} {peak / 2**20:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Tiempo y memoria de lectura del CSV de Stooq: inferencia vs. esquema declarado.
+
+Genera CSV sintéticos de 10k a 1M filas y mide cada modo de
+``core.ingest.parse_stooq_csv`` en un proceso aparte, para que el pico de
+memoria (RSS) de un caso no contamine al siguiente::
+
+    python benchmarks/bench_ingest.py --rows 10000 100000 1000000
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+MODES = {
+    'inferido': dict(fast=False),
+    'esquema-c': dict(fast=True, engine='c'),
+    'esquema-pyarrow': dict(fast=True, engine='pyarrow'),
+    'esquema-pyarrow-f32': dict(fast=True, engine='pyarrow', float_dtype='float32'),
+}
+
+
+def _peak_rss():
+    # ru_maxrss está en KB en Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def run_case(path, mode):
+    from core.ingest import parse_stooq_csv
+
+    raw = Path(path).read_bytes()
+    before = _peak_rss()
+    start = time.perf_counter()
+    data = parse_stooq_csv(raw, **MODES[mode])
+    elapsed = time.perf_counter() - start
+    return {
+        'segundos': elapsed,
+        'pico_mb': max(_peak_rss() - before, 0) / 2**20,
+        'frame_mb': data.memory_usage(deep=True).sum() / 2**20,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--case', nargs=2, metavar=('CSV', 'MODO'), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.case:
+        print(json.dumps(run_case(*args.case)))
+        return
+
+    from core.providers import synthetic_ohlcv
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'filas':>9} {'modo':<20} {'ms':>9} {'pico MB':>9} {'frame MB':>9}")
+        for rows in args.rows:
+            path = Path(tmp) / f'{rows}.csv'
+            synthetic_ohlcv(rows).to_csv(path, date_format='%Y-%m-%d')
+            for mode in MODES:
+                runs = [
+                    json.loads(subprocess.check_output(
+                        [sys.executable, __file__, '--case', str(path), mode], text=True))
+                    for _ in range(args.repeat)
+                ]
+                best = min(runs, key=lambda run: run['segundos'])
+                print(f"{rows:>9} {mode:<20} {best['segundos'] * 1000:>9.1f} "
+                      f"{best['pico_mb']:>9.1f} {best['frame_mb']:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
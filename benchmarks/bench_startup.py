@@ -0,0 +1,102 @@
+"""Tiempo de arranque: importaciones y primera carga de cada página.
+
+En frío cada medición corre en un proceso nuevo (como una réplica recién
+desplegada); en caliente se repite en el mismo proceso. Con ``--prewarm``
+se compara además la primera carga tras ``core.warmup.prewarm``. Usa el
+proveedor sintético, así que no hace falta red::
+
+    python benchmarks/bench_startup.py --runs 3 --prewarm
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+MODULES = ['streamlit', 'numpy', 'pandas', 'pyarrow', 'ta', 'plotly.graph_objects',
+           'plotly.express', 'plotly.subplots', 'core.data', 'core.warmup']
+
+
+def _child(argv):
+    """Se ejecuta en el proceso hijo e imprime los tiempos como JSON."""
+    sys.path.insert(0, str(ROOT))
+    kind = argv[0]
+    if kind == 'import':
+        start = time.perf_counter()
+        __import__(argv[1])
+        print(json.dumps({'cold': time.perf_counter() - start}))
+        return
+
+    from streamlit.testing.v1 import AppTest
+
+    result = {}
+    if argv[1] == 'prewarm':
+        from core.warmup import prewarm
+
+        start = time.perf_counter()
+        prewarm()
+        result['prewarm'] = time.perf_counter() - start
+
+    def load():
+        app = AppTest.from_file(str(ROOT / kind), default_timeout=120)
+        start = time.perf_counter()
+        app.run()
+        if kind.startswith('pages'):
+            app.button(key='actualizar').click().run()
+        if app.exception:
+            raise SystemExit(app.exception[0].value)
+        return time.perf_counter() - start
+
+    result['cold'] = load()
+    result['warm'] = load()
+    print(json.dumps(result))
+
+
+def _measure(*argv):
+    env = dict(os.environ, STOCK_DATA_PROVIDER='synthetic', STOCK_STORE_DIR='',
+               STOCK_REFRESH_INTERVAL='0', STOCK_PREWARM='0')
+    output = subprocess.run([sys.executable, __file__, '--child', *argv], env=env, cwd=ROOT,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _summary(label, samples):
+    keys = [key for key in ('prewarm', 'cold', 'warm') if key in samples[0]]
+    cells = '  '.join(f"{key}={statistics.median(s[key] for s in samples) * 1000:8.1f} ms"
+                      for key in keys)
+    print(f"{label:>32}: {cells}")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ['--child']:
+        return _child(argv[1:])
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--prewarm', action='store_true',
+                        help="mide también la primera carga después de precalentar")
+    args = parser.parse_args(argv)
+
+    print("importaciones (proceso nuevo, mediana):")
+    for module in MODULES:
+        try:
+            _summary(module, [_measure('import', module) for _ in range(args.runs)])
+        except subprocess.CalledProcessError:
+            print(f"{module:>32}: no instalado")
+
+    # La carga del dashboard incluye el clic en 'Actualizar' (primer gráfico)
+    print("páginas (cold = primera carga del proceso, warm = la siguiente):")
+    modes = ['none', 'prewarm'] if args.prewarm else ['none']
+    for page in ('main.py', 'pages/app.py'):
+        for mode in modes:
+            label = page if mode == 'none' else f'{page} + prewarm'
+            _summary(label, [_measure(page, mode) for _ in range(args.runs)])
+
+
+if __name__ == '__main__':
+    main()
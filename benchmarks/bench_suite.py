@@ -0,0 +1,226 @@
+"""Suite de rendimiento sin red: cada etapa de ``pages/app.py`` de 1k a 1M filas.
+
+Escribe un CSV sintético con formato Stooq por tamaño (o usa ``--fixture``
+con un CSV propio) y lo sirve con ``CSVDirectoryProvider``, así que no hace
+falta internet. Por etapa mide el tiempo (mínimo de ``--repeat``), el pico
+de memoria y los bloques que la etapa deja vivos (tracemalloc). Guarda el
+resultado en JSON y, con ``--baseline``, lo compara contra una corrida
+anterior y termina con error si alguna etapa empeoró más que
+``--tolerance``::
+
+    python benchmarks/bench_suite.py --output base.json
+    python benchmarks/bench_suite.py --baseline base.json --output nueva.json
+"""
+import argparse
+import ast
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+# Sin almacén en disco ni actualización en segundo plano: se mide la página sola
+os.environ['STOCK_STORE_DIR'] = ''
+os.environ['STOCK_REFRESH_INTERVAL'] = '0'
+# Las funciones de la página corren fuera de ``streamlit run``: sin avisos de contexto
+os.environ.setdefault('STREAMLIT_LOGGER_LEVEL', 'error')
+
+TICKER = 'BENCH'
+# Pisos de ruido: diferencias menores no cuentan como regresión
+MIN_SECONDS = 0.002
+MIN_MB = 1.0
+
+
+# ============================
+# FUNCIÓN: Funciones de la página
+# ============================
+def page_functions(path=ROOT / 'pages' / 'app.py'):
+    """Funciones de ``pages/app.py`` sin ejecutar la página.
+
+    Solo se evalúan las importaciones y las definiciones de funciones (sin
+    decoradores); la interfaz de Streamlit no se ejecuta.
+    """
+    tree = ast.parse(path.read_text(encoding='utf-8'))
+    tree.body = [node for node in tree.body
+                 if isinstance(node, (ast.Import, ast.ImportFrom))
+                 or (isinstance(node, ast.FunctionDef) and not node.decorator_list)]
+    namespace = {'__name__': 'bench_page'}
+    exec(compile(tree, str(path), 'exec'), namespace)
+    return namespace
+
+
+# ============================
+# FUNCIÓN: Medir una etapa
+# ============================
+def measure(run, setup=lambda: None, repeat=3):
+    """Tiempo mínimo de ``run(setup())`` y memoria de una corrida más con tracemalloc."""
+    times = []
+    for _ in range(repeat):
+        argument = setup()
+        start = time.perf_counter()
+        run(argument)
+        times.append(time.perf_counter() - start)
+
+    argument = setup()
+    gc.collect()
+    tracemalloc.start()
+    result = run(argument)
+    _, peak = tracemalloc.get_traced_memory()
+    # Lo que sigue vivo (el resultado de la etapa) de todo lo que se reservó
+    alive = tracemalloc.take_snapshot().statistics('filename')
+    tracemalloc.stop()
+    del result
+    return {
+        'segundos': min(times),
+        'pico_mb': peak / 2**20,
+        'retenido_mb': sum(stat.size for stat in alive) / 2**20,
+        'bloques': sum(stat.count for stat in alive),
+    }
+
+
+# ============================
+# FUNCIÓN: Etapas
+# ============================
+def run_stages(folder, rows, repeat):
+    from core import data
+    from core.indicators import INDICATORS, add_technical_indicators
+    from core.lod import POINT_BUDGET, decimate
+    from core.providers import CSVDirectoryProvider
+
+    page = page_functions()
+    provider = CSVDirectoryProvider(folder)
+    indicators = list(INDICATORS)
+    data.set_provider(provider)
+
+    def cold():
+        # Cada repetición empieza con las cachés vacías: lee y parsea el CSV
+        data.set_provider(provider)
+
+    def processed():
+        frame = page['fetch_stock_data'](TICKER, 'max')
+        return page['process_data'](add_technical_indicators(frame.copy()))
+
+    table = processed()
+
+    def series(column, method='lttb'):
+        return decimate(table, 'Datetime', column, POINT_BUDGET, method)
+
+    def figure(frame):
+        return page['combined_figure'](frame, series, POINT_BUDGET, TICKER, 'Candlestick',
+                                       indicators)
+
+    stages = {
+        'descarga': (lambda _: page['fetch_stock_data'](TICKER, 'max'), cold),
+        # Sin copia: process_data recibe la historia compartida, como en la página
+        'process_data': (page['process_data'], lambda: page['fetch_stock_data'](TICKER, 'max')),
+        'indicadores': (add_technical_indicators, lambda: provider.fetch(TICKER)),
+        'metricas': (page['calculate_metrics'], lambda: table),
+        'figura_combinada': (figure, lambda: table),
+        'figuras_separadas': (lambda frame: page['separate_figures'](
+            frame, series, POINT_BUDGET, TICKER, TICKER, 'Candlestick', indicators),
+            lambda: table),
+        'vista': (lambda _: page['build_view'](TICKER, 'max', '1d', 'Candlestick', indicators,
+                                               False), cold),
+    }
+    results = {}
+    for name, (run, setup) in stages.items():
+        results[name] = measure(run, setup, repeat)
+        results[name]['filas'] = rows
+    return results
+
+
+def write_fixture(folder, rows):
+    from core.providers import synthetic_ohlcv
+
+    synthetic_ohlcv(rows).to_csv(Path(folder) / f'{TICKER.lower()}.csv', date_format='%Y-%m-%d')
+
+
+# ============================
+# FUNCIÓN: Comparar con la base
+# ============================
+def regressions(results, baseline, tolerance):
+    """Etapas más lentas o con más pico de memoria que la base (más allá de ``tolerance``)."""
+    found = []
+    for size, stages in results.items():
+        for stage, current in stages.items():
+            before = baseline.get(size, {}).get(stage)
+            if before is None:
+                continue
+            for key, floor, unit in (('segundos', MIN_SECONDS, 's'), ('pico_mb', MIN_MB, 'MB')):
+                if (current[key] > before[key] * (1 + tolerance)
+                        and current[key] - before[key] > floor):
+                    found.append(f"{size} filas {stage}: {key} {before[key]:.4g} -> "
+                                 f"{current[key]:.4g} {unit} "
+                                 f"(+{current[key] / before[key] - 1:.0%})")
+    return found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+',
+                        default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--fixture', type=Path, help='CSV con formato Stooq en lugar del sintético')
+    parser.add_argument('--output', type=Path, help='archivo JSON para guardar los resultados')
+    parser.add_argument('--baseline', type=Path, help='JSON de una corrida anterior para comparar')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='empeoramiento relativo permitido (por defecto 0.25 = 25%%)')
+    args = parser.parse_args(argv)
+
+    import numpy
+    import pandas
+    import plotly
+
+    results = {}
+    with tempfile.TemporaryDirectory() as folder:
+        if args.fixture:
+            target = Path(folder) / f'{TICKER.lower()}.csv'
+            target.write_bytes(args.fixture.read_bytes())
+            sizes = [sum(1 for _ in target.open('rb')) - 1]
+        else:
+            sizes = args.rows
+        for rows in sizes:
+            if not args.fixture:
+                write_fixture(folder, rows)
+            results[str(rows)] = run_stages(folder, rows, args.repeat)
+
+    baseline = json.loads(args.baseline.read_text())['resultados'] if args.baseline else {}
+    print(f"{'filas':>9} {'etapa':<18} {'ms':>9} {'pico MB':>9} {'bloques':>9} {'vs base':>8}")
+    for size, stages in results.items():
+        for stage, result in stages.items():
+            before = baseline.get(size, {}).get(stage)
+            ratio = f"{result['segundos'] / before['segundos']:>7.2f}x" if before else ''
+            print(f"{size:>9} {stage:<18} {result['segundos'] * 1000:>9.1f} "
+                  f"{result['pico_mb']:>9.1f} {result['bloques']:>9} {ratio:>8}")
+
+    if args.output:
+        report = {
+            'fecha': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'versiones': {'numpy': numpy.__version__, 'pandas': pandas.__version__,
+                          'plotly': plotly.__version__},
+            'resultados': results,
+        }
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"\nResultados guardados en {args.output}")
+
+    if args.baseline:
+        found = regressions(results, baseline, args.tolerance)
+        if found:
+            print(f"\nRegresiones (tolerancia {args.tolerance:.0%}):")
+            for line in found:
+                print('  ' + line)
+            sys.exit(1)
+        print(f"\nSin regresiones contra {args.baseline} (tolerancia {args.tolerance:.0%})")
+
+
+if __name__ == '__main__':
+    main()
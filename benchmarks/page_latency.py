@@ -0,0 +1,62 @@
+"""Latencia de punta a punta de ``pages/app.py`` sin internet.
+
+Levanta el servidor Stooq local (``core.stooq_server``) con la latencia y
+tasa de fallas pedidas, apunta el dashboard a él y mide con ``AppTest``
+la carga inicial de la página (tarjetas) y el clic en 'Actualizar'::
+
+    python benchmarks/page_latency.py --runs 5 --latency 0.2
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--latency', type=float, default=0.1)
+    parser.add_argument('--failure-rate', type=float, default=0.0)
+    parser.add_argument('--period', default='max')
+    args = parser.parse_args(argv)
+
+    from core.stooq_server import start_server
+
+    server = start_server(latency=args.latency, failure_rate=args.failure_rate, seed=0)
+    os.environ['STOCK_DATA_PROVIDER'] = f'stooq:{server.base_url}'
+    os.environ['STOCK_STORE_DIR'] = ''
+
+    from streamlit.testing.v1 import AppTest
+    from core import data
+
+    results = {'cold': [], 'warm': [], 'actualizar': []}
+    for _ in range(args.runs):
+        data.history_cache.invalidate()
+        for label in ('cold', 'warm'):
+            app = AppTest.from_file(str(ROOT / 'pages' / 'app.py'), default_timeout=120)
+            start = time.perf_counter()
+            app.run()
+            results[label].append(time.perf_counter() - start)
+            if app.exception:
+                raise SystemExit(app.exception[0].value)
+
+        app.selectbox(key='periodo').select(args.period)
+        start = time.perf_counter()
+        app.button(key='actualizar').click().run()
+        results['actualizar'].append(time.perf_counter() - start)
+
+    server.shutdown()
+    print(f"servidor: latencia={args.latency}s fallas={args.failure_rate:.0%} "
+          f"peticiones={server.requests}")
+    for label, times in results.items():
+        print(f"{label:>10}: mediana={statistics.median(times) * 1000:8.1f} ms  "
+              f"min={min(times) * 1000:8.1f} ms  max={max(times) * 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
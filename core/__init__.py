@@ -0,0 +1,6 @@
+"""Lógica de datos del dashboard, separada de los scripts de Streamlit.
+
+Los módulos de este paquete se importan una sola vez por proceso, por lo que
+el estado que guardan (cachés, almacenes) se comparte entre todas las
+sesiones y todos los reruns de ``pages/app.py``.
+"""
@@ -0,0 +1,121 @@
+"""Archivos estáticos de la intro con URL versionada por contenido.
+
+Con ``server.enableStaticServing`` Streamlit sirve la carpeta ``static/``
+en ``/app/static/``, con ``ETag`` y rangos HTTP (el audio se reproduce y
+se adelanta sin bajarlo entero). ``asset_url`` agrega a la URL un hash del
+contenido: si el archivo cambia, cambia la URL, así que el navegador puede
+guardar cada versión sin volver a preguntar. ``StaticCacheMiddleware``
+pone esas cabeceras de caché (lo monta ``serve.py``). Sin static serving
+la página usa las rutas locales y ``data_uri``.
+"""
+import base64
+import hashlib
+import mimetypes
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import parse_qs, quote
+
+STATIC_DIR = Path(__file__).resolve().parents[1] / 'static'
+STATIC_ROUTE = '/app/static/'
+
+# URL versionada: un año y sin revalidar; sin versión: revalidar siempre (304 si no cambió)
+IMMUTABLE = b'public, max-age=31536000, immutable'
+REVALIDATE = b'no-cache'
+
+
+# ============================
+# FUNCIONES: Rutas y URL de los archivos
+# ============================
+def asset_path(name):
+    return STATIC_DIR / name
+
+
+def asset_url(name):
+    """URL de ``static/<name>`` con ``?v=`` según su contenido."""
+    stat = asset_path(name).stat()
+    return f'{STATIC_ROUTE}{quote(name)}?v={_digest(name, stat.st_mtime_ns, stat.st_size)}'
+
+
+@lru_cache(maxsize=64)
+def _digest(name, mtime_ns, size):
+    # La fecha y el tamaño son parte de la clave: un archivo editado se vuelve a leer
+    digest = hashlib.sha256()
+    with open(asset_path(name), 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
+def data_uri(name):
+    """Contenido de ``static/<name>`` como URI ``data:`` (para archivos chicos)."""
+    stat = asset_path(name).stat()
+    return _data_uri(name, stat.st_mtime_ns)
+
+
+@lru_cache(maxsize=16)
+def _data_uri(name, mtime_ns):
+    mime = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+    encoded = base64.b64encode(asset_path(name).read_bytes()).decode('ascii')
+    return f'data:{mime};base64,{encoded}'
+
+
+def read_text(path):
+    """Texto de ``path``; se lee de disco solo la primera vez o si cambió."""
+    path = Path(path)
+    return _read_text(path, path.stat().st_mtime_ns)
+
+
+@lru_cache(maxsize=16)
+def _read_text(path, mtime_ns):
+    return path.read_text(encoding='utf-8')
+
+
+# ============================
+# CLASE: Cabeceras de caché
+# ============================
+class StaticCacheMiddleware:
+    """Middleware ASGI con las cabeceras de caché de ``/app/static/``.
+
+    - URL con ``?v=`` (de ``asset_url``): ``Cache-Control`` de un año e
+      ``immutable``; el navegador no vuelve a pedirla.
+    - Sin versión: ``no-cache``. El navegador revalida con ``If-None-Match``
+      y, si el ``ETag`` coincide, recibe un 304 sin cuerpo.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or STATIC_ROUTE not in scope['path']:
+            await self.app(scope, receive, send)
+            return
+        versioned = 'v' in parse_qs(scope.get('query_string', b'').decode('latin-1'))
+        cache_control = IMMUTABLE if versioned else REVALIDATE
+        if_none_match = dict(scope['headers']).get(b'if-none-match')
+        not_modified = False
+
+        async def send_with_cache(message):
+            nonlocal not_modified
+            if message['type'] == 'http.response.start':
+                status, headers = message['status'], list(message.get('headers', []))
+                if status in (200, 206):
+                    headers.append((b'cache-control', cache_control))
+                etag = dict(headers).get(b'etag')
+                if status == 200 and etag and if_none_match and etag in _etags(if_none_match):
+                    not_modified = True
+                    keep = (b'etag', b'last-modified', b'cache-control', b'date', b'server')
+                    headers = [(key, value) for key, value in headers if key in keep]
+                    status = 304
+                message = dict(message, status=status, headers=headers)
+            elif message['type'] == 'http.response.body' and not_modified:
+                # El cuerpo del 200 se descarta; se cierra la respuesta vacía
+                if message.get('more_body', False):
+                    return
+                message = {'type': 'http.response.body', 'body': b''}
+            await send(message)
+
+        await self.app(scope, receive, send_with_cache)
+
+
+def _etags(header):
+    return {tag.strip().removeprefix(b'W/') for tag in header.split(b',')}
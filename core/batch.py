@@ -0,0 +1,154 @@
+"""Cálculo por lotes sin Streamlit: indicadores y métricas de un universo de tickers.
+
+    python -m core.batch universo.txt --store data/store/stooq --output data/batch
+    python -m core.batch universo.txt --csv-dir data/csv --output data/batch --workers 8
+
+El universo es un archivo de texto con un ticker por línea (o separados por
+coma) con el mismo símbolo que usa el dashboard (p. ej. ``AAPL.US``); lo
+que sigue a ``#`` es comentario. La historia se lee del almacén en disco
+(``core.store``) o de una carpeta de CSV con formato Stooq, sin red. Cada
+ticker se procesa en un pool de procesos (uno por núcleo por defecto) y se
+escribe en ``--output``:
+
+- ``indicators/<TICKER>.parquet``: OHLCV más todos los indicadores (lo
+  escribe el mismo proceso que lo calcula, no viaja entre procesos);
+- ``metrics.parquet``: una fila por ticker y período del dashboard.
+
+Con ``--update-store`` también se guardan indicadores y estado incremental
+en el almacén, de donde ``core.data.get_indicators`` los toma al arrancar.
+Termina con código 1 si algún ticker falló.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from core.compute import PERIODS, compute_indicators, period_metrics
+from core.providers import CSVDirectoryProvider
+from core.store import OHLCVStore
+
+
+# ============================
+# FUNCIÓN: Leer el universo
+# ============================
+def read_universe(path):
+    """Tickers del archivo ``path`` (en mayúsculas, sin repetir, en orden)."""
+    tickers = []
+    for line in Path(path).read_text(encoding='utf-8').splitlines():
+        line = line.split('#', 1)[0]
+        tickers += [ticker.strip().upper() for ticker in line.replace(',', ' ').split()]
+    return list(dict.fromkeys(tickers))
+
+
+def load_history(ticker, store=None, csv_dir=None):
+    if store is not None:
+        return OHLCVStore(store).read(ticker)
+    return CSVDirectoryProvider(csv_dir).fetch(ticker)
+
+
+# ============================
+# FUNCIÓN: Procesar un ticker
+# ============================
+def process_ticker(ticker, output, store=None, csv_dir=None, update_store=False, now=None):
+    """Calcula y escribe un ticker; se ejecuta en un proceso del pool.
+
+    Devuelve ``(ticker, filas de métricas, error)`` con ``error`` en texto
+    o ``None``.
+    """
+    try:
+        history = load_history(ticker, store, csv_dir)
+        if history.empty:
+            return ticker, [], 'sin datos'
+        frame, stream = compute_indicators(history)
+        _write_parquet(history.join(frame), Path(output) / 'indicators' / f'{ticker}.parquet')
+        if update_store and store is not None:
+            OHLCVStore(store).save_indicators(ticker, frame, stream.to_dict())
+        rows = [dict(row, ticker=ticker) for row in period_metrics(history, PERIODS, now)]
+        return ticker, rows, None
+    except Exception as error:
+        return ticker, [], f'{type(error).__name__}: {error}'
+
+
+def _write_parquet(data, path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.tmp')
+    data.to_parquet(tmp)
+    os.replace(tmp, path)
+
+
+# ============================
+# FUNCIÓN: Procesar el universo
+# ============================
+def run_batch(tickers, output, store=None, csv_dir=None, workers=None, update_store=False,
+              now=None, progress=None):
+    """Procesa ``tickers`` en un pool de ``workers`` procesos (núcleos por defecto).
+
+    Escribe ``metrics.parquet`` en ``output`` y devuelve ``(métricas, errores)``
+    con ``errores`` como dict ``ticker -> texto``. ``progress(ticker, error)``
+    se llama a medida que termina cada ticker.
+    """
+    output = Path(output)
+    now = now or datetime.now()
+    rows, errors = [], {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(process_ticker, ticker, output, store, csv_dir, update_store, now)
+                   for ticker in tickers]
+        for future in as_completed(futures):
+            ticker, ticker_rows, error = future.result()
+            rows += ticker_rows
+            if error is not None:
+                errors[ticker] = error
+            if progress is not None:
+                progress(ticker, error)
+
+    columns = ['ticker', 'period', 'rows', 'start', 'end', 'last_close', 'change', 'pct_change',
+               'high', 'low', 'volume']
+    metrics = pd.DataFrame(rows, columns=columns)
+    # Mismo orden que el universo y los períodos, sin importar qué proceso terminó primero
+    metrics['ticker'] = pd.Categorical(metrics['ticker'], categories=tickers)
+    metrics['period'] = pd.Categorical(metrics['period'], categories=PERIODS)
+    metrics = metrics.sort_values(['ticker', 'period'], ignore_index=True)
+    metrics[['ticker', 'period']] = metrics[['ticker', 'period']].astype(str)
+    _write_parquet(metrics, output / 'metrics.parquet')
+    return metrics, errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('universe', type=Path, help='archivo con un ticker por línea')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--store', type=Path, help='almacén Parquet del proveedor (p. ej. data/store/stooq)')
+    source.add_argument('--csv-dir', type=Path, help='carpeta de CSV con formato Stooq')
+    parser.add_argument('--output', type=Path, default=Path('data/batch'))
+    parser.add_argument('--workers', type=int, default=None, help='procesos (por defecto, núcleos)')
+    parser.add_argument('--update-store', action='store_true',
+                        help='guardar también indicadores y estado en el almacén')
+    args = parser.parse_args(argv)
+
+    tickers = read_universe(args.universe)
+    if not tickers:
+        parser.error(f'{args.universe} no tiene tickers')
+
+    done = 0
+
+    def progress(ticker, error):
+        nonlocal done
+        done += 1
+        print(f"[{done}/{len(tickers)}] {ticker}: {error or 'ok'}", file=sys.stderr)
+
+    start = time.perf_counter()
+    _, errors = run_batch(tickers, args.output, args.store, args.csv_dir, args.workers,
+                          args.update_store, progress=progress)
+    print(f"{len(tickers) - len(errors)} de {len(tickers)} tickers en "
+          f"{time.perf_counter() - start:.1f} s -> {args.output}")
+    if errors:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
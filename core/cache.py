@@ -0,0 +1,186 @@
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+
+# ============================
+# FUNCIÓN: Tamaño aproximado de un valor
+# ============================
+def estimate_size(value):
+    """Devuelve el tamaño en bytes de ``value`` (deep para DataFrames)."""
+    memory_usage = getattr(value, 'memory_usage', None)
+    if memory_usage is not None:
+        try:
+            usage = memory_usage(deep=True)
+            return int(usage.sum()) if hasattr(usage, 'sum') else int(usage)
+        except TypeError:
+            pass
+    if isinstance(value, (tuple, list)):
+        return sum(estimate_size(item) for item in value)
+    if isinstance(value, dict):
+        return sum(estimate_size(item) for item in value.values())
+    return sys.getsizeof(value)
+
+
+# ============================
+# CLASE: Caché TTL + LRU acotada por tamaño
+# ============================
+class TTLCache:
+    """Caché compartida por proceso con expiración, límite LRU y límite de bytes.
+
+    - ``ttl``: segundos que una entrada se considera vigente.
+    - ``max_entries``: cantidad máxima de claves (se desaloja la menos usada).
+    - ``max_bytes``: tamaño total máximo; se desalojan entradas LRU hasta
+      que el total vuelva a entrar. Un valor más grande que el límite no se
+      guarda.
+    """
+
+    def __init__(self, ttl=900, max_entries=64, max_bytes=256 * 1024 * 1024,
+                 sizeof=estimate_size, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._clock = clock
+        self._entries = OrderedDict()  # clave -> (valor, expira, bytes)
+        self._total_bytes = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    @property
+    def total_bytes(self):
+        return self._total_bytes
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, expires, _ = entry
+            if expires <= self._clock():
+                self._remove(key)
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        size = self._sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                return
+            expires = self._clock() + (self.ttl if ttl is None else ttl)
+            self._entries[key] = (value, expires, size)
+            self._total_bytes += size
+            self._evict()
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._total_bytes = 0
+            elif key in self._entries:
+                self._remove(key)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+    def _remove(self, key):
+        _, _, size = self._entries.pop(key)
+        self._total_bytes -= size
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries
+                                 or self._total_bytes > self.max_bytes):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+
+
+# ============================
+# CLASE: Coalescencia de cargas en curso ("single-flight")
+# ============================
+class SingleFlight:
+    """Hace que llamadas concurrentes con la misma clave compartan una carga.
+
+    El primer hilo que pide ``key`` ejecuta ``loader()``; los que llegan
+    mientras tanto esperan y reciben el mismo resultado (o la misma
+    excepción).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}  # clave -> Future
+
+    def do(self, key, loader):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+        if not leader:
+            return future.result()
+        try:
+            future.set_result(loader())
+        except BaseException as exc:
+            future.set_exception(exc)
+        finally:
+            with self._lock:
+                del self._calls[key]
+        return future.result()
+
+
+class KeyedLock:
+    """Un lock por clave: trabajos con claves distintas no se esperan entre sí.
+
+    ``with locks(key):`` serializa solo a quienes usan la misma ``key``; el
+    lock se descarta cuando nadie lo usa.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._locks = {}  # clave -> [Lock, usuarios]
+
+    @contextmanager
+    def __call__(self, key):
+        with self._lock:
+            entry = self._locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._locks[key]
+
+# ============================
+# FUNCIÓN: Caché configurada por variables de entorno
+# ============================
+def cache_from_env(prefix, ttl=900, max_entries=64, max_mb=256):
+    """Crea una ``TTLCache`` leyendo ``<PREFIX>_TTL``, ``_MAX_ENTRIES`` y ``_MAX_MB``."""
+    return TTLCache(
+        ttl=float(os.environ.get(f'{prefix}_TTL', ttl)),
+        max_entries=int(os.environ.get(f'{prefix}_MAX_ENTRIES', max_entries)),
+        max_bytes=int(float(os.environ.get(f'{prefix}_MAX_MB', max_mb)) * 1024 * 1024),
+    )
@@ -0,0 +1,95 @@
+"""Cálculos del dashboard que no dependen de Streamlit.
+
+``pages/app.py`` y el cálculo por lotes (``core.batch``) usan las mismas
+funciones: métricas de un período, indicadores con su estado incremental y
+rendimientos acumulados para comparar tickers.
+"""
+import numpy as np
+import pandas as pd
+
+from core.indicators import add_technical_indicators, resolve
+from core.periods import slice_period
+from core.streaming import IndicatorStream
+
+# Períodos que ofrece el dashboard (ver core.periods.slice_period)
+PERIODS = ['5d', '1mo', '3mo', '6mo', '1y', 'max']
+METRICS = ['last_close', 'change', 'pct_change', 'high', 'low', 'volume']
+# Tickers que se pueden superponer en el modo comparación
+MAX_COMPARE = 50
+
+
+# ============================
+# FUNCIÓN: Calcular métricas
+# ============================
+def calculate_metrics(data):
+    if data.empty:
+        return 0, 0, 0, 0, 0, 0
+    last_close = data['Close'].iloc[-1]
+    prev_close = data['Close'].iloc[0]
+    change = last_close - prev_close
+    pct_change = (change / prev_close) * 100 if prev_close != 0 else 0
+    high = data['High'].max()
+    low = data['Low'].min()
+    volume = data['Volume'].sum() if 'Volume' in data.columns else 0
+    return last_close, change, pct_change, high, low, volume
+
+
+def period_metrics(history, periods=PERIODS, now=None):
+    """Métricas de ``history`` para cada período: una fila (dict) por período."""
+    rows = []
+    for period in periods:
+        data = slice_period(history, period, now)
+        row = dict(zip(METRICS, map(float, calculate_metrics(data))))
+        row.update(period=period, rows=len(data),
+                   start=data.index[0] if len(data) else None,
+                   end=data.index[-1] if len(data) else None)
+        rows.append(row)
+    return rows
+
+
+# ============================
+# FUNCIÓN: Indicadores con estado
+# ============================
+def compute_indicators(history, selected=None):
+    """Indicadores ``selected`` (todos por defecto) y su estado incremental.
+
+    Devuelve ``(frame, stream)`` con las mismas columnas y el mismo estado
+    que guarda ``core.data.get_indicators``.
+    """
+    names = resolve(selected)
+    frame = add_technical_indicators(history[['High', 'Low', 'Close']].copy(), names)
+    return frame.drop(columns=['High', 'Low', 'Close']), IndicatorStream.from_history(history, names)
+
+
+# ============================
+# FUNCIÓN: Comparar tickers
+# ============================
+def align_closes(histories, period='max', now=None):
+    """Cierres de ``histories`` (``{ticker: DataFrame}``) en una tabla fechas × tickers.
+
+    Las historias se unen por fecha en un solo ``concat`` (unión de las
+    fechas; NaN donde un ticker no cotizó) y ``period`` se recorta después
+    sobre ese calendario común, igual para todos.
+    """
+    if not histories:
+        return pd.DataFrame()
+    closes = pd.concat({ticker: data['Close'] for ticker, data in histories.items()},
+                       axis=1, sort=True)
+    return slice_period(closes, period, now)
+
+
+def cumulative_returns(closes):
+    """Rendimiento acumulado (%) de cada columna desde su primer cierre del período.
+
+    Los huecos (feriados de un solo mercado) repiten el último cierre; antes
+    del primer cierre de un ticker queda NaN. El cálculo es una sola
+    operación sobre la matriz fechas × tickers.
+    """
+    if closes.empty:
+        return closes.astype(np.float64)
+    values = closes.ffill().to_numpy(dtype=np.float64)
+    rows = np.isfinite(values).argmax(axis=0)
+    base = values[rows, np.arange(values.shape[1])]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = (values / np.where(base > 0, base, np.nan) - 1) * 100
+    return pd.DataFrame(returns, index=closes.index, columns=closes.columns)
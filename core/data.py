@@ -0,0 +1,295 @@
+import contextvars
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+
+from core.cache import KeyedLock, SingleFlight, cache_from_env
+from core.indicators import add_technical_indicators, indicator_columns, resolve
+from core.periods import PERIOD_BARS, PERIOD_DAYS, slice_period
+from core.providers import provider_from_env
+from core.rollups import INTERVALS, extend_rollup, resample_ohlcv
+from core.store import store_from_env
+from core.streaming import IndicatorStream, new_bars
+
+# Fuente de datos (STOCK_DATA_PROVIDER: stooq, stooq:<url>, csv:<carpeta>, synthetic)
+provider = provider_from_env()
+
+# Historia completa por ticker, compartida por todas las sesiones.
+# Configurable con STOCK_CACHE_TTL, STOCK_CACHE_MAX_ENTRIES y STOCK_CACHE_MAX_MB.
+history_cache = cache_from_env('STOCK_CACHE', ttl=900, max_entries=64, max_mb=256)
+
+# Historia persistente entre reinicios (STOCK_STORE_DIR, vacío = desactivado),
+# separada por fuente (proveedor y URL o carpeta) para no mezclar datos de
+# orígenes distintos
+history_store = store_from_env(subdir=provider.store_name)
+
+# Velas semanales/mensuales/trimestrales por (ticker, intervalo), que se
+# extienden con las barras diarias nuevas (STOCK_ROLLUP_CACHE_TTL, ...)
+rollup_cache = cache_from_env('STOCK_ROLLUP_CACHE', ttl=900, max_entries=256, max_mb=64)
+
+# Indicadores de toda la historia por ticker (e intervalo) con su estado
+# incremental (STOCK_INDICATOR_CACHE_TTL, _MAX_ENTRIES, _MAX_MB)
+indicator_cache = cache_from_env('STOCK_INDICATOR_CACHE', ttl=900, max_entries=64, max_mb=128)
+# Un cálculo por ticker e intervalo a la vez; los demás tickers no esperan
+_derived_locks = KeyedLock()
+
+# Vistas ya armadas (métricas, figuras en JSON y tablas) por combinación de
+# parámetros y versión de la historia (STOCK_VIEW_CACHE_TTL, ...)
+view_cache = cache_from_env('STOCK_VIEW_CACHE', ttl=900, max_entries=128, max_mb=128)
+
+# Descargas simultáneas del mismo ticker comparten una sola petición
+_inflight = SingleFlight()
+
+# Hilos para descargar varios tickers a la vez (STOCK_FETCH_WORKERS)
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get('STOCK_FETCH_WORKERS', 8)),
+    thread_name_prefix='stock-fetch',
+)
+
+
+# ============================
+# FUNCIÓN: Descargar historia completa
+# ============================
+def download_history(ticker, start=None):
+    """Descarga la historia diaria de ``ticker`` desde el proveedor activo.
+
+    Con ``start`` solo se piden las barras desde esa fecha.
+    """
+    return provider.fetch(ticker, start)
+
+
+# ============================
+# FUNCIÓN: Historia desde el almacén en disco
+# ============================
+def load_history(ticker):
+    """Historia completa: del almacén en disco más la cola nueva, o del proveedor."""
+    if history_store is None:
+        return download_history(ticker)
+    return history_store.sync(ticker, download_history)
+
+
+# ============================
+# FUNCIÓN: Cambiar de proveedor
+# ============================
+def set_provider(new_provider, store=None):
+    """Reemplaza el proveedor activo (y el almacén) y vacía la caché."""
+    global provider, history_store
+    provider = new_provider
+    history_store = store
+    history_cache.invalidate()
+    rollup_cache.invalidate()
+    indicator_cache.invalidate()
+    view_cache.invalidate()
+
+
+# ============================
+# FUNCIÓN: Historia con caché
+# ============================
+def get_history(ticker):
+    """Devuelve la historia completa de ``ticker`` desde la caché del proceso.
+
+    Si otra sesión ya está descargando el mismo ticker se espera esa
+    descarga en lugar de iniciar otra. Los DataFrames vacíos no se guardan
+    para no fijar un fallo transitorio durante todo el TTL. El valor
+    devuelto es compartido: no modificarlo.
+    """
+    key = ticker.upper()
+    data = history_cache.get(key)
+    if data is None:
+        data = _inflight.do(key, lambda: _load_and_cache(key, ticker))
+    return data
+
+
+def _load_and_cache(key, ticker):
+    # Otra carga pudo haber terminado entre la consulta y el single-flight
+    data = history_cache.get(key)
+    if data is not None:
+        return data
+    data = load_history(ticker)
+    if not data.empty:
+        history_cache.set(key, data)
+    return data
+
+
+# ============================
+# FUNCIÓN: Refrescar la historia en caché
+# ============================
+def refresh_history(ticker, ttl=None):
+    """Vuelve a cargar la historia de ``ticker`` y reemplaza la de la caché.
+
+    Mientras tanto las sesiones siguen viendo la versión anterior; si una
+    sesión pide el ticker sin tenerlo en caché, espera esta misma carga.
+    ``ttl`` reemplaza la vigencia por defecto de la caché.
+    """
+    key = ticker.upper()
+    data = _inflight.do(key, lambda: load_history(ticker))
+    if not data.empty:
+        history_cache.set(key, data, ttl=ttl)
+    return data
+
+
+# ============================
+# FUNCIÓN: Versión de la historia
+# ============================
+def history_version(ticker):
+    """Firma de la historia actual de ``ticker`` para invalidar resultados derivados.
+
+    Cambia cuando llegan barras nuevas o se corrige alguna de las últimas
+    (las que vuelve a pedir ``OHLCVStore.sync``). ``None`` si no hay datos.
+    """
+    return data_version(get_history(ticker))
+
+
+def data_version(data):
+    """Firma de ``data``: largo más un hash de las últimas filas (``None`` si está vacío)."""
+    if data.empty:
+        return None
+    tail = pd.util.hash_pandas_object(data.tail(16), index=True)
+    return len(data), int(tail.sum())
+
+
+# ============================
+# FUNCIÓN: Varias historias en paralelo
+# ============================
+def fetch_many(tickers):
+    """Descarga ``tickers`` en paralelo y los entrega a medida que terminan.
+
+    Genera tuplas ``(ticker, data, error)``; ``error`` es la excepción de la
+    descarga (``data`` vacío) o ``None``.
+    """
+    # Cada descarga corre con una copia del contexto: sus tiempos (core.timing)
+    # se suman a la ejecución de la página que la pidió
+    futures = {_executor.submit(contextvars.copy_context().run, get_history, ticker): ticker
+               for ticker in tickers}
+    for future in as_completed(futures):
+        error = future.exception()
+        data = pd.DataFrame() if error else future.result()
+        yield futures[future], data, error
+
+
+# ============================
+# FUNCIÓN: Velas por intervalo
+# ============================
+def get_bars(ticker, interval='1d', ttl=None):
+    """Historia de ``ticker`` en velas de ``interval`` (ver ``core.rollups.INTERVALS``).
+
+    Las velas agrupadas se calculan una vez por ticker y, cuando la
+    historia diaria suma barras, solo se rehace la última vela. ``ttl``
+    reemplaza la vigencia por defecto de la caché (y la renueva aunque no
+    haya barras nuevas). El valor devuelto es compartido: no modificarlo.
+    """
+    history = get_history(ticker)
+    frequency = INTERVALS[interval]
+    if frequency is None or history.empty:
+        return history
+
+    key = (ticker.upper(), interval)
+    with _derived_locks(('velas', key)):
+        cached = rollup_cache.get(key)
+        daily = None if cached is None else new_bars(history, *cached[1:])
+        if daily is None:
+            bars = resample_ohlcv(history, frequency)
+        elif len(daily):
+            bars = extend_rollup(cached[0], daily, frequency)
+        elif ttl is None:
+            return cached[0]
+        else:
+            bars = cached[0]
+        rollup_cache.set(key, (bars, history.index[-1], history['Close'].iloc[-1]), ttl=ttl)
+    return bars
+
+
+def get_period_bars(ticker, period, interval='1d', now=None):
+    """Velas de ``interval`` de ``ticker`` dentro de ``period``.
+
+    El período se recorta sobre la historia diaria y recién después se
+    agrupa: "5d" en velas trimestrales es una vela con esas 5 sesiones, no
+    los últimos 5 trimestres. "max" usa las velas ya agrupadas de
+    ``get_bars``. El valor puede ser compartido: no modificarlo.
+    """
+    frequency = INTERVALS[interval]
+    if frequency is None or (period not in PERIOD_BARS and period not in PERIOD_DAYS):
+        return slice_period(get_bars(ticker, interval), period, now)
+    # Como mucho un año de barras diarias: agruparlas de nuevo es barato
+    return resample_ohlcv(slice_period(get_history(ticker), period, now), frequency)
+
+
+# ============================
+# FUNCIÓN: Indicadores de toda la historia
+# ============================
+def get_indicators(ticker, selected=None, interval='1d', ttl=None):
+    """Indicadores ``selected`` sobre toda la historia de ``ticker``.
+
+    La primera vez se calculan vectorizados y se inicializa su estado
+    (``core.streaming``); cuando la historia solo suma barras nuevas, el
+    estado avanza barra a barra en lugar de recalcular la serie entera.
+    Con almacén en disco, indicadores y estado se guardan junto a la
+    historia y sobreviven a un reinicio. El valor devuelto es compartido:
+    no modificarlo.
+
+    Con otro ``interval`` se calculan sobre las velas de ``get_bars`` y se
+    guardan en memoria hasta que esas velas cambian (la última vela puede
+    estar en curso, así que no se avanza barra a barra).
+
+    ``ttl`` reemplaza la vigencia por defecto de la caché en memoria, como
+    en ``refresh_history``.
+    """
+    history = get_bars(ticker, interval, ttl)
+    names = resolve(selected)
+    if history.empty or not names:
+        return pd.DataFrame(index=history.index)
+    if interval != '1d':
+        return _interval_indicators(ticker, history, names, interval, ttl)[indicator_columns(selected)]
+
+    key = ticker.upper()
+    state = None
+    with _derived_locks(('indicadores', key)):
+        cached = in_memory = indicator_cache.get(key)
+        if cached is None and history_store is not None:
+            saved = history_store.load_indicators(key)
+            if saved is not None:
+                cached = saved[0], IndicatorStream.from_dict(saved[1])
+
+        bars = None
+        if cached is not None and set(names) <= set(cached[1].names):
+            frame, stream = cached
+            bars = stream.new_bars(history)
+        if bars is None:
+            # Sin estado, con otros indicadores o con la historia corregida
+            if cached is not None:
+                names = resolve(list(dict.fromkeys(cached[1].names + names)))
+            frame = add_technical_indicators(history[['High', 'Low', 'Close']].copy(), names)
+            frame = frame.drop(columns=['High', 'Low', 'Close'])
+            stream = IndicatorStream.from_history(history, names)
+        elif len(bars):
+            frame = pd.concat([frame, stream.extend(bars)])
+
+        changed = bars is None or len(bars) > 0
+        if changed or in_memory is None or ttl is not None:
+            indicator_cache.set(key, (frame, stream), ttl=ttl)
+        if changed and history_store is not None:
+            # Copia del estado: otro hilo puede seguir avanzando ``stream``
+            state = stream.to_dict()
+    # Escritura en disco fuera del lock. Si dos escrituras se cruzan y queda
+    # la más vieja, sigue siendo un estado válido: al leerla se avanza
+    # desde su última barra.
+    if state is not None:
+        history_store.save_indicators(key, frame, state)
+    return frame[indicator_columns(selected)]
+
+
+def _interval_indicators(ticker, bars, names, interval, ttl=None):
+    key = (ticker.upper(), interval)
+    with _derived_locks(('indicadores', key)):
+        cached = indicator_cache.get(key)
+        if cached is not None and cached[0] is bars:
+            if set(names) <= set(cached[1]):
+                if ttl is not None:
+                    indicator_cache.set(key, cached, ttl=ttl)
+                return cached[2]
+            names = resolve(list(dict.fromkeys(cached[1] + names)))
+        frame = add_technical_indicators(bars[['High', 'Low', 'Close']].copy(), names)
+        frame = frame.drop(columns=['High', 'Low', 'Close'])
+        indicator_cache.set(key, (bars, names, frame), ttl=ttl)
+    return frame
@@ -0,0 +1,296 @@
+"""Indicadores técnicos vectorizados sobre arrays de NumPy.
+
+Cada función recibe un array de forma ``(n,)`` o ``(n, k)`` (fechas en el
+eje 0, una columna por ticker) y devuelve arrays de la misma forma, con los
+mismos valores que la librería ``ta`` (``fillna=False``). Los ``NaN``
+iniciales de una columna se tratan como una historia más corta: el
+resultado es el mismo que aplicar ``ta`` a la serie recortada.
+
+Todos los algoritmos son O(n) y sin bucles por fila:
+
+- sumas móviles por diferencias de sumas acumuladas reiniciadas cada
+  ``_BLOCK`` filas (el reinicio evita perder precisión en series largas);
+- EMA recursiva resuelta por bloques, con el arrastre entre bloques
+  truncado donde su peso cae por debajo de la precisión de float64;
+- mínimo y máximo móviles con el algoritmo de van Herk / Gil-Werman.
+
+Las columnas con NaN en el medio o al final (un cierre faltante) se
+resuelven como ``ta``: las ventanas con un NaN dan NaN y las EMA siguen la
+recursión de ``pandas.ewm`` sobre el hueco (esas columnas se calculan con
+pandas).
+"""
+import numpy as np
+import pandas as pd
+
+_BLOCK = 1024
+
+
+# ============================
+# FUNCIONES AUXILIARES
+# ============================
+def _as_2d(values):
+    array = np.asarray(values, dtype=np.float64)
+    return array.reshape(len(array), -1), array.ndim == 1
+
+
+def _restore(array, was_1d):
+    return array[:, 0] if was_1d else array
+
+
+def _first_valid(x):
+    """Índice de la primera fila no NaN de cada columna (n si no hay)."""
+    valid = ~np.isnan(x)
+    return np.where(valid.any(axis=0), valid.argmax(axis=0), len(x))
+
+
+def _mask_warmup(out, start):
+    """Pone NaN en las filas anteriores a ``start`` (por columna)."""
+    for column, rows in enumerate(np.minimum(start, len(out))):
+        out[:rows, column] = np.nan
+    return out
+
+
+def _window_sum(x, window, square=False, zero_missing=False):
+    """Suma (de cuadrados si ``square``) de las últimas ``window`` filas.
+
+    Las primeras ``window - 1`` filas quedan en NaN. Las sumas acumuladas se
+    reinician cada ``_BLOCK`` filas, así el error de redondeo no crece con
+    el largo de la serie. Con ``zero_missing`` los NaN/inf suman 0.
+    """
+    n, k = x.shape
+    if window > n:
+        return np.full(x.shape, np.nan)
+    block = max(_BLOCK, window)
+    pad = -n % block
+    cumsum = np.empty((n + pad, k))
+    cumsum[:n] = x
+    cumsum[n:] = 0.0
+    if zero_missing:
+        cumsum[~np.isfinite(cumsum)] = 0.0
+    if square:
+        np.square(cumsum, out=cumsum)
+    cumsum = cumsum.reshape(-1, block, k)
+    np.cumsum(cumsum, axis=1, out=cumsum)
+
+    sums = np.empty_like(cumsum)
+    # Ventanas dentro de un bloque
+    np.subtract(cumsum[:, window:], cumsum[:, :-window], out=sums[:, window:])
+    # Ventanas que empiezan en el bloque anterior
+    np.subtract(cumsum[:-1, -1:], cumsum[:-1, block - window:], out=sums[1:, :window])
+    sums[1:, :window] += cumsum[1:, :window]
+    sums[0, :window] = cumsum[0, :window]
+    out = sums.reshape(-1, k)[:n]
+    out[:window - 1] = np.nan
+    return out
+
+
+def _rolling_moments(x, window, variance=True):
+    """Media y varianza poblacional móviles; NaN si la ventana tiene algún NaN o inf."""
+    missing = ~np.isfinite(x)
+    has_missing = missing.any()
+    if has_missing:
+        # Caso común: solo faltan las primeras filas (historia más corta o
+        # calentamiento de otro indicador); alcanza con enmascarar el inicio
+        present = ~missing
+        start = np.where(present.any(axis=0), present.argmax(axis=0), len(x))
+        leading_only = missing.sum() == np.minimum(start, len(x)).sum()
+        if leading_only:
+            del missing, present
+
+    mean = _window_sum(x, window, zero_missing=has_missing)
+    mean /= window
+    var = None
+    if variance:
+        var = _window_sum(x, window, square=True, zero_missing=has_missing)
+        var /= window
+        var -= np.square(mean)
+        np.maximum(var, 0.0, out=var)
+    if has_missing:
+        if leading_only:
+            _mask_warmup(mean, start + window - 1)
+            if variance:
+                _mask_warmup(var, start + window - 1)
+        else:
+            incomplete = _window_sum(missing.astype(np.float64), window) != 0
+            mean[incomplete] = np.nan
+            if variance:
+                var[incomplete] = np.nan
+    return mean, var
+
+
+def _ewm(x, alpha):
+    """EMA recursiva ``y[t] = alpha * x[t] + (1 - alpha) * y[t-1]`` (adjust=False).
+
+    Empieza en el primer valor válido de cada columna; las filas previas
+    quedan en NaN. Las columnas con NaN después del primer valor válido se
+    calculan con ``pandas.ewm`` (lo que usa ``ta``): en un hueco se repite
+    el último valor y el peso del anterior sigue decayendo.
+    """
+    n, k = x.shape
+    if n == 0:
+        return x.copy()
+    missing = np.isnan(x)
+    has_missing = missing.any()
+    start = _first_valid(x) if has_missing else np.zeros(k, dtype=int)
+    if has_missing:
+        gaps = missing.sum(axis=0) != np.minimum(start, n)
+        if gaps.any():
+            out = _ewm(np.where(gaps, np.nan, x), alpha)
+            out[:, gaps] = pd.DataFrame(x[:, gaps]).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+            return out
+    first = x[np.minimum(start, n - 1), np.arange(k)]
+    decay = 1.0 - alpha
+    # Bloque más largo con decay**-block <= 1e3: cumsum escalada sin pérdida
+    block = int(np.clip(np.log(1e3) / -np.log(decay), 1, n)) if decay > 0 else 1
+    pad = -n % block
+
+    blocks = np.empty((n + pad, k))
+    blocks[:n] = x
+    blocks[n:] = 0.0
+    if has_missing:
+        # Los NaN iniciales se reemplazan por el primer valor: la EMA de una
+        # constante es esa constante, así que el resultado desde ``start`` no cambia
+        head = np.arange(n)[:, None] < start[None, :]
+        blocks[:n][head] = np.broadcast_to(first, (n, k))[head]
+    blocks = blocks.reshape(-1, block, k)
+
+    # Dentro de cada bloque, partiendo de estado 0:
+    #   y[t] = shrink[t] * S[t],  S = cumsum(alpha * x / shrink)
+    # y con el estado ``previous`` al inicio del bloque:
+    #   y[t] = shrink[t] * (S[t] + decay * previous)
+    shrink = decay ** np.arange(block, dtype=np.float64)
+    blocks *= (alpha / shrink)[None, :, None]
+    partial = np.cumsum(blocks, axis=1, out=blocks)
+
+    # Estado al final de cada bloque: c[j] = decay**block * c[j-1] + y0[j, -1].
+    # decay**block <= 1e-3, así que bastan unos pocos términos para float64.
+    factor = decay ** block
+    ends = partial[:, -1] * shrink[-1]
+    carry = ends.copy()
+    terms = int(np.ceil(np.log(1e-18) / np.log(factor))) if 0 < factor < 1 else len(ends)
+    terms = min(terms, len(ends))
+    power = 1.0
+    for m in range(1, terms):
+        power *= factor
+        carry[m:] += power * ends[:-m]
+    carry[:terms] += np.power(factor, np.arange(1, terms + 1))[:, None] * first[None, :]
+
+    previous = np.concatenate([first[None, :], carry[:-1]])
+    partial += (decay * previous)[:, None, :]
+    partial *= shrink[None, :, None]
+    out = partial.reshape(-1, k)[:n]
+    return _mask_warmup(out, start) if has_missing else out
+
+
+def _rolling_extreme(x, window, reduce):
+    """Mínimo/máximo móvil de van Herk / Gil-Werman: O(n) para cualquier ventana."""
+    n, k = x.shape
+    if window > n:
+        return np.full(x.shape, np.nan)
+    pad = -n % window
+    # Relleno neutro: +inf para el mínimo, -inf para el máximo
+    blocks = np.full((n + pad, k), np.inf if reduce is np.minimum else -np.inf)
+    blocks[:n] = x
+    blocks = blocks.reshape(-1, window, k)
+    suffix = np.empty_like(blocks)
+    reduce.accumulate(blocks[:, ::-1], axis=1, out=suffix[:, ::-1])
+    suffix = suffix.reshape(-1, k)
+    prefix = reduce.accumulate(blocks, axis=1, out=blocks).reshape(-1, k)
+    # Cada ventana es sufijo de un bloque + prefijo del siguiente
+    out = suffix[:n]
+    reduce(suffix[:n - window + 1], prefix[window - 1:n], out=out[window - 1:])
+    out[:window - 1] = np.nan
+    return out
+
+
+def _warmup(x, window):
+    return _first_valid(x) + window - 1
+
+
+# ============================
+# INDICADORES
+# ============================
+def ewm(values, alpha):
+    """EMA recursiva sin calentamiento (``ewm(alpha=alpha, adjust=False)``).
+
+    A diferencia de ``ema``, no enmascara las primeras ``window - 1`` filas:
+    sirve para obtener el estado final de la recursión.
+    """
+    x, was_1d = _as_2d(values)
+    return _restore(_ewm(x, alpha), was_1d)
+
+
+def sma(close, window=20):
+    x, was_1d = _as_2d(close)
+    mean, _ = _rolling_moments(x, window, variance=False)
+    return _restore(mean, was_1d)
+
+
+def ema(close, window=20):
+    x, was_1d = _as_2d(close)
+    out = _ewm(x, 2.0 / (window + 1))
+    return _restore(_mask_warmup(out, _warmup(x, window)), was_1d)
+
+
+def rsi(close, window=14):
+    x, was_1d = _as_2d(close)
+    n, k = x.shape
+    start = _first_valid(x)
+    diff = np.empty(x.shape)
+    diff[0] = 0.0
+    np.subtract(x[1:], x[:-1], out=diff[1:])
+    # Subas y bajas en un solo array para suavizarlas con una sola pasada
+    moves = np.empty((n, 2 * k))
+    np.maximum(diff, 0.0, out=moves[:, :k])
+    np.negative(diff, out=diff)
+    np.maximum(diff, 0.0, out=moves[:, k:])
+    del diff
+    # Como ta, un cierre faltante cuenta como movimiento 0
+    np.nan_to_num(moves, copy=False, nan=0.0)
+    # Igual que ta: la serie de subas/bajas empieza en 0 en la primera fila válida
+    if start.any():
+        _mask_warmup(moves, np.concatenate([start, start]))
+        for column, row in enumerate(start):
+            if row < n:
+                moves[row, [column, column + k]] = 0.0
+    smoothed = _ewm(moves, 1.0 / window)
+    ema_up, ema_down = smoothed[:, :k], smoothed[:, k:]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # 100 - 100 / (1 + up/down) == 100 * up / (up + down)
+        out = 100.0 * ema_up / (ema_up + ema_down)
+    out[ema_down == 0] = 100.0
+    return _restore(_mask_warmup(out, start + window - 1), was_1d)
+
+
+def macd(close, window_slow=26, window_fast=12, window_sign=9):
+    """Devuelve ``(macd, señal, histograma)``."""
+    x, was_1d = _as_2d(close)
+    fast = _ewm(x, 2.0 / (window_fast + 1))
+    slow = _mask_warmup(_ewm(x, 2.0 / (window_slow + 1)), _warmup(x, window_slow))
+    line = _mask_warmup(fast, _warmup(x, window_fast)) - slow
+    signal = _mask_warmup(_ewm(line, 2.0 / (window_sign + 1)), _warmup(line, window_sign))
+    return (_restore(line, was_1d), _restore(signal, was_1d),
+            _restore(line - signal, was_1d))
+
+
+def rolling_std(close, window=20):
+    """Desvío estándar poblacional móvil (``ddof=0``, como las Bandas de Bollinger de ta)."""
+    x, was_1d = _as_2d(close)
+    _, variance = _rolling_moments(x, window)
+    return _restore(np.sqrt(variance, out=variance), was_1d)
+
+
+def stochastic(high, low, close, window=14, smooth_window=3):
+    """Devuelve ``(%K, %D)``."""
+    h, was_1d = _as_2d(high)
+    lo, _ = _as_2d(low)
+    c, _ = _as_2d(close)
+    lowest = _rolling_extreme(lo, window, np.minimum)
+    spread = _rolling_extreme(h, window, np.maximum)
+    spread -= lowest
+    k = np.subtract(c, lowest, out=lowest)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        k *= 100.0
+        k /= spread
+    d, _ = _rolling_moments(k, smooth_window, variance=False)
+    return _restore(k, was_1d), _restore(d, was_1d)
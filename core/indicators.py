@@ -0,0 +1,194 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from core import engine
+
+
+# ============================
+# CLASE: Definición de un indicador
+# ============================
+@dataclass(frozen=True)
+class Indicator:
+    """Indicador técnico registrado.
+
+    - ``name``: nombre que se muestra en el multiselect.
+    - ``columns``: columnas que agrega al DataFrame.
+    - ``compute(data)``: recibe un DataFrame o un dict ``columna -> array``
+      (``(n,)`` o un panel ``(n, k)``) y devuelve un dict ``columna -> array``
+      de la misma forma; puede leer las columnas de los indicadores listados
+      en ``depends``.
+    """
+
+    name: str
+    columns: tuple
+    compute: object
+    depends: tuple = field(default=())
+
+
+INDICATORS = {}
+
+
+def register(name, columns, depends=()):
+    """Decorador que agrega ``compute`` al registro con su nombre y columnas."""
+    def decorator(compute):
+        INDICATORS[name] = Indicator(name, tuple(columns), compute, tuple(depends))
+        return compute
+    return decorator
+
+
+# ============================
+# INDICADORES (motor NumPy de core.engine, mismos valores que ta)
+# ============================
+@register('SMA 20', ['SMA_20'])
+def _sma_20(data):
+    return {'SMA_20': engine.sma(np.asarray(data['Close']), window=20)}
+
+
+@register('EMA 20', ['EMA_20'])
+def _ema_20(data):
+    return {'EMA_20': engine.ema(np.asarray(data['Close']), window=20)}
+
+
+@register('RSI 14', ['RSI_14'])
+def _rsi_14(data):
+    return {'RSI_14': engine.rsi(np.asarray(data['Close']), window=14)}
+
+
+@register('MACD', ['MACD', 'MACD_Signal', 'MACD_Hist'])
+def _macd(data):
+    line, signal, hist = engine.macd(np.asarray(data['Close']))
+    return {'MACD': line, 'MACD_Signal': signal, 'MACD_Hist': hist}
+
+
+@register('Bollinger Bands', ['BB_High', 'BB_Low'], depends=['SMA 20'])
+def _bollinger(data):
+    # La banda media de Bollinger (20, 2) es la SMA 20 ya calculada
+    middle = np.asarray(data['SMA_20'])
+    width = 2 * engine.rolling_std(np.asarray(data['Close']), window=20)
+    return {'BB_High': middle + width, 'BB_Low': middle - width}
+
+
+@register('Stochastic Oscillator', ['Stoch_%K', 'Stoch_%D'])
+def _stochastic(data):
+    k, d = engine.stochastic(
+        np.asarray(data['High']),
+        np.asarray(data['Low']),
+        np.asarray(data['Close']),
+        window=14,
+        smooth_window=3
+    )
+    return {'Stoch_%K': k, 'Stoch_%D': d}
+
+
+# ============================
+# FUNCIÓN: Resolver dependencias
+# ============================
+def resolve(selected=None):
+    """Indicadores a calcular para ``selected`` (todos si es ``None``), dependencias primero."""
+    names = list(INDICATORS) if selected is None else list(selected)
+    order = []
+
+    def visit(name):
+        if name in order:
+            return
+        if name not in INDICATORS:
+            raise KeyError(f"Indicador desconocido: {name!r}")
+        for dependency in INDICATORS[name].depends:
+            visit(dependency)
+        order.append(name)
+
+    for name in names:
+        visit(name)
+    return order
+
+
+def indicator_columns(selected=None):
+    """Columnas que agregan los indicadores elegidos (sin las de sus dependencias)."""
+    names = list(INDICATORS) if selected is None else selected
+    return [column for name in names for column in INDICATORS[name].columns]
+
+
+# ============================
+# FUNCIÓN: Indicadores técnicos
+# ============================
+def add_technical_indicators(data, selected=None):
+    """Agrega a ``data`` solo las columnas de los indicadores ``selected``.
+
+    Sin ``selected`` se calculan todos. Las dependencias (p. ej. la SMA 20
+    para las Bandas de Bollinger) se calculan una única vez.
+    """
+    if data.empty:
+        return data
+
+    for name in resolve(selected):
+        indicator = INDICATORS[name]
+        if all(column in data.columns for column in indicator.columns):
+            continue
+        for column, values in indicator.compute(data).items():
+            data[column] = values
+
+    return data
+
+
+# ============================
+# FUNCIÓN: Indicadores para varios tickers (panel)
+# ============================
+def build_panel(histories, columns=('High', 'Low', 'Close')):
+    """Alinea las historias ``{ticker: DataFrame}`` por fecha.
+
+    Devuelve ``(fechas, tickers, panel)`` con ``panel[columna]`` de forma
+    ``(fechas, tickers)``; las fechas que un ticker no tiene quedan en NaN.
+    """
+    tickers = list(histories)
+    dates = pd.DatetimeIndex([])
+    for data in histories.values():
+        dates = dates.union(data.index)
+    panel = {}
+    for column in columns:
+        panel[column] = np.full((len(dates), len(tickers)), np.nan)
+        for position, ticker in enumerate(tickers):
+            data = histories[ticker]
+            panel[column][dates.get_indexer(data.index), position] = data[column].to_numpy()
+    return dates, tickers, panel
+
+
+def compute_panel(panel, selected=None):
+    """Calcula los indicadores ``selected`` para todos los tickers de ``panel``.
+
+    ``panel`` es un dict ``columna -> array (fechas, tickers)`` (ver
+    ``build_panel``) y se usan las mismas definiciones del registro que en
+    ``add_technical_indicators``. Los NaN al inicio de una columna son una
+    historia más corta y se resuelven en la misma pasada vectorizada; las
+    columnas con huecos en el medio o al final se calculan aparte sobre sus
+    fechas válidas. Devuelve un dict ``columna -> array (fechas, tickers)``
+    que incluye las columnas de las dependencias.
+    """
+    close = np.asarray(panel['Close'], dtype=np.float64)
+    present = ~np.isnan(close)
+    n, k = close.shape
+    # Con historia contigua, las filas válidas son un sufijo de la columna
+    contiguous = present.sum(axis=0) == n - np.where(present.any(axis=0), present.argmax(axis=0), n)
+
+    names = resolve(selected)
+    columns = {column: np.asarray(values, dtype=np.float64) for column, values in panel.items()}
+    results = _compute(columns, names) if contiguous.all() else _compute(
+        {column: np.where(contiguous, values, np.nan) for column, values in columns.items()},
+        names,
+    )
+    for position in np.flatnonzero(~contiguous):
+        rows = present[:, position]
+        single = _compute({column: values[rows, position] for column, values in columns.items()},
+                          names)
+        for column, values in single.items():
+            results[column][:, position] = np.nan
+            results[column][rows, position] = values
+    return results
+
+
+def _compute(data, names):
+    data = dict(data)
+    for name in names:
+        data.update(INDICATORS[name].compute(data))
+    return {column: data[column] for name in names for column in INDICATORS[name].columns}
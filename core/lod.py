@@ -0,0 +1,133 @@
+"""Nivel de detalle: menos puntos para los gráficos de períodos largos.
+
+Un gráfico no puede mostrar más puntos que píxeles de ancho, así que por
+encima de ``POINT_BUDGET`` puntos (STOCK_CHART_POINTS) las series se
+reducen antes de armar la figura:
+
+- líneas con LTTB (Largest-Triangle-Three-Buckets), que conserva la forma;
+- barras (histograma del MACD) con mínimo y máximo por tramo, que conserva
+  los extremos;
+- muchas líneas sobre las mismas fechas (comparación de tickers) con una
+  fecha de cada tantas, la misma para todas;
+- velas agrupadas en velas semanales, mensuales, trimestrales o anuales
+  (apertura, máximo, mínimo, cierre y volumen del intervalo).
+
+Con ``budget=None`` todo se devuelve sin reducir (resolución completa).
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from core.rollups import resample_ohlcv
+
+POINT_BUDGET = int(os.environ.get('STOCK_CHART_POINTS', 2000))
+# Puntos por figura desde los que las líneas se dibujan con WebGL (Scattergl)
+WEBGL_POINTS = int(os.environ.get('STOCK_WEBGL_POINTS', 5000))
+
+# Intervalos para agrupar velas (del más fino al más grueso) y días que abarca cada uno
+OHLC_FREQUENCIES = {'W': 7, 'M': 30.44, 'Q': 91.31, 'Y': 365.25}
+OHLC_LABELS = {'W': 'semanales', 'M': 'mensuales', 'Q': 'trimestrales', 'Y': 'anuales'}
+
+
+# ============================
+# FUNCIONES: Índices a conservar
+# ============================
+def lttb_indices(x, y, threshold):
+    """Índices de los ``threshold`` puntos que elige LTTB (primero y último incluidos)."""
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # threshold - 2 tramos entre el primer y el último punto; el último
+    # "tramo siguiente" es el punto final
+    edges = np.append(np.linspace(1, n - 1, threshold - 1).astype(np.int64), n)
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    selected = 0
+    for bucket in range(threshold - 2):
+        start, end, stop = edges[bucket], edges[bucket + 1], edges[bucket + 2]
+        next_x, next_y = x[end:stop].mean(), y[end:stop].mean()
+        # Doble del área del triángulo (punto elegido, candidato, promedio siguiente)
+        area = np.abs((x[selected] - next_x) * (y[start:end] - y[selected])
+                      - (x[selected] - x[start:end]) * (next_y - y[selected]))
+        selected = start + int(area.argmax())
+        keep[bucket + 1] = selected
+    return keep
+
+
+def minmax_indices(y, threshold):
+    """Índices del mínimo y el máximo de cada tramo (como mucho ``threshold`` puntos)."""
+    n = len(y)
+    if threshold >= n or threshold < 4:
+        return np.arange(n)
+    y = np.asarray(y, dtype=np.float64)
+    buckets = (threshold - 2) // 2
+    size = -(-n // buckets)
+    # Relleno con el último valor: nunca gana a un extremo real del tramo
+    padded = np.concatenate([y, np.full(size * buckets - n, y[-1])]).reshape(buckets, size)
+    base = np.arange(buckets) * size
+    keep = np.concatenate([[0, n - 1], base + padded.argmin(axis=1), base + padded.argmax(axis=1)])
+    return np.unique(np.minimum(keep, n - 1))
+
+
+def stride_indices(n, threshold):
+    """Posiciones equiespaciadas (primera y última incluidas), como mucho ``threshold``."""
+    if threshold >= n or threshold < 2:
+        return np.arange(n)
+    step = -(-(n - 1) // (threshold - 1))
+    return np.append(np.arange(0, n - 1, step), n - 1)
+
+
+# ============================
+# FUNCIÓN: Reducir una serie
+# ============================
+def decimate(data, x, y, budget=POINT_BUDGET, method='lttb'):
+    """Filas de ``data`` a graficar para la serie ``y`` contra la columna ``x``.
+
+    ``method`` es ``'lttb'`` (líneas) o ``'minmax'`` (barras). Las filas con
+    ``y`` vacío (calentamiento del indicador) se descartan antes de reducir.
+    """
+    if budget is None or len(data) <= budget:
+        return data
+    data = data[data[y].notna()]
+    if method == 'minmax':
+        keep = minmax_indices(data[y].to_numpy(), budget)
+    else:
+        dates = data[x]
+        position = dates.astype('int64') if pd.api.types.is_datetime64_any_dtype(dates) else dates
+        keep = lttb_indices(position.to_numpy(), data[y].to_numpy(), budget)
+    return data.iloc[keep]
+
+
+# ============================
+# FUNCIÓN: Fechas para Plotly
+# ============================
+def epoch_ms(dates):
+    """Fechas como milisegundos desde 1970 (UTC).
+
+    Un eje ``type='date'`` de Plotly las muestra igual que las fechas, pero
+    viajan como números en binario en lugar de un texto ISO por punto.
+    """
+    # float64: Plotly solo codifica en binario arrays de punto flotante / int32
+    return dates.to_numpy(dtype='datetime64[ns]').view('int64') / 1e6
+
+
+# ============================
+# FUNCIÓN: Velas agrupadas
+# ============================
+def aggregate_ohlc(data, budget=POINT_BUDGET, date_column='Datetime'):
+    """Agrupa las velas diarias en el intervalo más fino que entra en ``budget``.
+
+    Devuelve ``(velas, intervalo)``; ``intervalo`` es ``None`` si no hizo
+    falta agrupar, o una clave de ``OHLC_FREQUENCIES``. Cada vela agrupada
+    se ubica en la fecha de su primera barra.
+    """
+    if budget is None or len(data) <= budget:
+        return data, None
+    dates = data[date_column]
+    days = (dates.iloc[-1] - dates.iloc[0]).days + 1
+    frequency = next((freq for freq, length in OHLC_FREQUENCIES.items() if days / length <= budget),
+                     'Y')
+    return resample_ohlcv(data.set_index(date_column), frequency).reset_index(), frequency
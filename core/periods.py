@@ -0,0 +1,48 @@
+"""Recorte de la historia a los períodos del dashboard.
+
+Sin estado ni efectos al importar: lo usan ``core.data`` (con sus cachés y
+el proveedor) y también ``core.compute`` y el cálculo por lotes, que no
+deben arrancarlos.
+"""
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+# Períodos en sesiones (últimas N barras) y en días calendario; "max" = todo
+PERIOD_BARS = {'5d': 5}
+PERIOD_DAYS = {'1mo': 30, '3mo': 90, '6mo': 180, '1y': 365}
+
+
+# ============================
+# FUNCIÓN: Recortar período
+# ============================
+def last_bars(data, bars):
+    """Últimas ``bars`` filas de ``data`` (sesiones, sin importar el calendario)."""
+    return data.iloc[len(data) - min(bars, len(data)):]
+
+
+def since(data, start):
+    """Filas de ``data`` (índice de fechas ordenado) desde ``start`` inclusive.
+
+    Búsqueda binaria sobre el índice: O(log n) y sin recorrer ni copiar la
+    historia (el resultado es una vista).
+    """
+    unit = getattr(data.index, 'unit', None)
+    if unit is not None:
+        # Índices en segundos (CSV de Stooq) no comparan con microsegundos de ``now``
+        start = pd.Timestamp(start).ceil(unit).as_unit(unit)
+    return data.iloc[data.index.searchsorted(start, side='left'):]
+
+
+def slice_period(data, period, now=None):
+    """Devuelve las filas de ``data`` dentro de ``period``.
+
+    Los períodos de ``PERIOD_BARS`` cuentan sesiones (barras) hacia atrás;
+    los de ``PERIOD_DAYS``, días calendario desde ``now``. Cualquier otro
+    valor ("max") devuelve toda la historia.
+    """
+    if period in PERIOD_BARS:
+        return last_bars(data, PERIOD_BARS[period])
+    if period in PERIOD_DAYS:
+        return since(data, (now or datetime.now()) - timedelta(days=PERIOD_DAYS[period]))
+    return data
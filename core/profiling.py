@@ -0,0 +1,135 @@
+"""Grabador de ejecuciones lentas: perfiles de cProfile de los casos raros.
+
+Con STOCK_PROFILE_THRESHOLD_MS (desactivado por defecto) cada ejecución
+de la página corre bajo ``cProfile`` y, si tarda al menos ese umbral, el
+perfil se guarda en STOCK_PROFILE_DIR (por defecto ``data/profiles``)
+junto con los parámetros pedidos (ticker, período, indicadores...) y los
+tiempos por etapa de ``core.timing``. Se conservan los últimos
+STOCK_PROFILE_KEEP perfiles (por defecto 20). Los ``.prof`` se abren con
+``pstats`` o herramientas como snakeviz.
+
+Se perfila una ejecución a la vez por proceso: desde Python 3.12 cProfile
+usa un único perfilador global (``sys.monitoring``) y un segundo
+``enable()`` falla, así que mientras una sesión se perfila las demás
+corren sin perfil. Hasta 3.11 el perfil mide solo el hilo de la página (las
+descargas en paralelo de las tarjetas aparecen como espera en
+``as_completed``); desde 3.12 incluye todos los hilos del proceso que
+corrieron mientras tanto, también los de otras sesiones.
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+from datetime import datetime
+from pathlib import Path
+
+
+# ============================
+# CLASE: Grabador de perfiles
+# ============================
+class FlightRecorder:
+    """Perfila cada ejecución y guarda en ``directory`` las que superan ``threshold`` segundos."""
+
+    def __init__(self, directory, threshold, keep=20):
+        self.directory = Path(directory)
+        self.threshold = threshold
+        self.keep = keep
+        # (hilo, perfil) de la ejecución que se está perfilando
+        self._active = None
+        self._lock = threading.Lock()
+
+    def begin(self):
+        """Empieza a perfilar la ejecución en curso en este hilo.
+
+        Devuelve ``None`` sin perfilar si otra ejecución ya se está
+        perfilando (o si otra herramienta ocupa el perfilador).
+        """
+        thread = threading.current_thread()
+        with self._lock:
+            if self._active is not None:
+                owner, previous = self._active
+                if owner is not thread and owner.is_alive():
+                    return None
+                # Una ejecución interrumpida (p. ej. por un clic) deja su perfil abierto
+                previous.disable()
+                self._active = None
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Python 3.12+: "Another profiling tool is already active"
+                return None
+            self._active = (thread, profiler)
+        return profiler
+
+    def finish(self, seconds, params=None, stages=None):
+        """Cierra el perfil de este hilo; lo guarda si la ejecución tardó ``threshold`` o más.
+
+        Devuelve la ruta del ``.prof`` guardado o ``None``.
+        """
+        with self._lock:
+            if self._active is None or self._active[0] is not threading.current_thread():
+                return None
+            profiler = self._active[1]
+            profiler.disable()
+            self._active = None
+        if seconds < self.threshold:
+            return None
+
+        now = datetime.now()
+        name = f"{now:%Y%m%d-%H%M%S-%f}_{seconds * 1000:.0f}ms"
+        meta = {
+            'momento': now.astimezone().isoformat(timespec='seconds'),
+            'total_ms': round(seconds * 1000, 2),
+            'parametros': params or {},
+            'etapas_ms': {stage: round(value * 1000, 2) for stage, value in (stages or {}).items()},
+            'resumen': summary(profiler),
+        }
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self.directory / f'{name}.prof'
+            profiler.dump_stats(path)
+            (self.directory / f'{name}.json').write_text(
+                json.dumps(meta, ensure_ascii=False, indent=2, default=str), encoding='utf-8')
+            self._prune()
+        return path
+
+    def profiles(self):
+        """Perfiles guardados, del más reciente al más viejo: ``[(ruta .prof, metadatos)]``."""
+        found = []
+        for path in sorted(self.directory.glob('*.prof'), reverse=True):
+            try:
+                meta = json.loads(path.with_suffix('.json').read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                meta = {}
+            found.append((path, meta))
+        return found
+
+    def _prune(self):
+        for path in sorted(self.directory.glob('*.prof'), reverse=True)[self.keep:]:
+            path.unlink(missing_ok=True)
+            path.with_suffix('.json').unlink(missing_ok=True)
+
+
+def summary(profiler, limit=25):
+    """Las ``limit`` funciones con más tiempo acumulado, como texto de ``pstats``."""
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(limit)
+    return out.getvalue()
+
+
+# ============================
+# FUNCIÓN: Grabador configurado por entorno
+# ============================
+def recorder_from_env():
+    """Grabador según STOCK_PROFILE_THRESHOLD_MS / _DIR / _KEEP; ``None`` si está desactivado."""
+    threshold = float(os.environ.get('STOCK_PROFILE_THRESHOLD_MS', 0) or 0)
+    if threshold <= 0:
+        return None
+    return FlightRecorder(os.environ.get('STOCK_PROFILE_DIR', 'data/profiles'),
+                          threshold / 1000, int(os.environ.get('STOCK_PROFILE_KEEP', 20)))
+
+
+recorder = recorder_from_env()
@@ -0,0 +1,196 @@
+import os
+import urllib.request
+import zlib
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from core.ingest import parse_stooq_csv
+from core.timing import span
+
+STOOQ_BASE_URL = "https://stooq.com"
+
+
+# ============================
+# CLASE BASE: Proveedor de datos de mercado
+# ============================
+class MarketDataProvider(ABC):
+    """Fuente de historia diaria OHLCV.
+
+    ``fetch(ticker, start=None)`` devuelve un DataFrame indexado por
+    ``Date`` con columnas Open, High, Low, Close y Volume (vacío si el
+    ticker no existe) y lanza una excepción si la fuente falla.
+    """
+
+    name = 'base'
+
+    @property
+    def store_name(self):
+        """Carpeta del almacén en disco: una por fuente concreta, no por clase."""
+        return self.name
+
+    @abstractmethod
+    def fetch(self, ticker, start=None):
+        raise NotImplementedError
+
+    def __repr__(self):
+        return f"{type(self).__name__}()"
+
+
+# ============================
+# PROVEEDOR: Stooq por HTTP
+# ============================
+class StooqProvider(MarketDataProvider):
+    """Endpoint ``/q/d/l/?s=<ticker>&i=d`` de Stooq (o un servidor compatible)."""
+
+    name = 'stooq'
+
+    def __init__(self, base_url=STOOQ_BASE_URL, timeout=10):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    @property
+    def store_name(self):
+        # Stooq real conserva "stooq"; otro servidor no debe mezclarse con él
+        if self.base_url == STOOQ_BASE_URL:
+            return self.name
+        return f"{self.name}-{source_id(self.base_url)}"
+
+    def url(self, ticker, start=None):
+        url = f"{self.base_url}/q/d/l/?s={ticker.lower()}&i=d"
+        if start is not None:
+            url += f"&d1={start:%Y%m%d}&d2={datetime.now():%Y%m%d}"
+        return url
+
+    def fetch(self, ticker, start=None):
+        with span('red'):
+            with urllib.request.urlopen(self.url(ticker, start), timeout=self.timeout) as response:
+                raw = response.read()
+        with span('csv'):
+            return parse_stooq_csv(raw)
+
+    def __repr__(self):
+        return f"StooqProvider({self.base_url!r})"
+
+
+# ============================
+# PROVEEDOR: Carpeta local de CSV
+# ============================
+class CSVDirectoryProvider(MarketDataProvider):
+    """Lee ``<root>/<ticker en minúsculas>.csv`` con el mismo formato que Stooq."""
+
+    name = 'csv'
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    @property
+    def store_name(self):
+        return f"{self.name}-{source_id(self.root.resolve())}"
+
+    def path(self, ticker):
+        return self.root / f"{ticker.lower()}.csv"
+
+    def fetch(self, ticker, start=None):
+        path = self.path(ticker)
+        if not path.exists():
+            return pd.DataFrame()
+        with span('csv'):
+            data = parse_stooq_csv(path)
+        if start is not None and not data.empty:
+            data = data[data.index >= pd.Timestamp(start)]
+        return data
+
+    def __repr__(self):
+        return f"CSVDirectoryProvider({str(self.root)!r})"
+
+
+# ============================
+# FUNCIÓN: Generar OHLCV sintético
+# ============================
+def synthetic_ohlcv(rows=None, seed=0, start='1999-01-04', end=None):
+    """Serie OHLCV reproducible (paseo aleatorio geométrico en días hábiles).
+
+    Con ``rows`` se generan exactamente esa cantidad de barras desde
+    ``start``; si no, todas las barras hábiles entre ``start`` y ``end``
+    (hoy por defecto).
+    """
+    if rows is None:
+        dates = pd.bdate_range(start, end or datetime.now().date())
+    else:
+        dates = pd.bdate_range(start, periods=rows)
+    n = len(dates)
+    rng = np.random.default_rng(seed)
+    # Paseo aleatorio en escala logarítmica "plegado" dentro de 5-500 USD,
+    # para que las series de millones de barras no exploten ni se anulen
+    log_low, width = np.log(5), np.log(500 / 5)
+    walk = np.log(100) - log_low + np.cumsum(rng.normal(0.0003, 0.02, n))
+    close = np.exp(log_low + width - np.abs(np.mod(walk, 2 * width) - width))
+    open_ = np.empty(n)
+    open_[0] = close[0]
+    open_[1:] = close[:-1] * (1 + rng.normal(0, 0.005, n - 1))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.01, n)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.01, n)))
+    volume = rng.integers(1_000_000, 50_000_000, n)
+    return pd.DataFrame(
+        {'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume},
+        index=pd.DatetimeIndex(dates, name='Date'),
+    ).round(4)
+
+
+# ============================
+# PROVEEDOR: Datos sintéticos
+# ============================
+class SyntheticProvider(MarketDataProvider):
+    """Historia inventada pero estable: cada ticker siempre genera la misma serie."""
+
+    name = 'synthetic'
+
+    def __init__(self, seed=0, start='1999-01-04'):
+        self.seed = seed
+        self.start = start
+
+    @property
+    def store_name(self):
+        return self.name if self.seed == 0 else f"{self.name}-{self.seed}"
+
+    def fetch(self, ticker, start=None):
+        seed = zlib.crc32(ticker.upper().encode()) ^ self.seed
+        data = synthetic_ohlcv(seed=seed, start=self.start)
+        if start is not None:
+            data = data[data.index >= pd.Timestamp(start)]
+        return data
+
+    def __repr__(self):
+        return f"SyntheticProvider(seed={self.seed})"
+
+
+def source_id(source):
+    """Identificador corto y estable de una URL o carpeta (CRC32 en hex)."""
+    return f"{zlib.crc32(str(source).encode()):08x}"
+
+
+# ============================
+# FUNCIÓN: Proveedor configurado por variables de entorno
+# ============================
+def provider_from_env():
+    """Crea el proveedor indicado en ``STOCK_DATA_PROVIDER``.
+
+    - ``stooq`` (por defecto) o ``stooq:<url base>``, p. ej.
+      ``stooq:http://127.0.0.1:8765`` para el servidor local.
+    - ``csv:<carpeta>``
+    - ``synthetic`` o ``synthetic:<semilla>``
+    """
+    spec = os.environ.get('STOCK_DATA_PROVIDER', 'stooq')
+    kind, _, arg = spec.partition(':')
+    timeout = float(os.environ.get('STOCK_FETCH_TIMEOUT', 10))
+    if kind == 'stooq':
+        return StooqProvider(arg or STOOQ_BASE_URL, timeout=timeout)
+    if kind == 'csv':
+        return CSVDirectoryProvider(arg or 'data/csv')
+    if kind == 'synthetic':
+        return SyntheticProvider(seed=int(arg or 0))
+    raise ValueError(f"Proveedor de datos desconocido: {spec!r}")
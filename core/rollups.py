@@ -0,0 +1,75 @@
+"""Velas semanales, mensuales y trimestrales a partir de la historia diaria.
+
+Cada vela agrupada toma la apertura de su primera barra diaria, el máximo y
+el mínimo del intervalo, el cierre de la última barra y la suma del
+volumen, y se ubica en la fecha de su primera barra. ``extend_rollup``
+agrega barras diarias nuevas rehaciendo solo la última vela (que puede
+estar en curso) en lugar de reagrupar toda la historia.
+"""
+import numpy as np
+import pandas as pd
+
+# Intervalo -> frecuencia de pandas (None = barras diarias sin agrupar)
+INTERVALS = {'1d': None, '1wk': 'W', '1mo': 'M', '3mo': 'Q'}
+INTERVAL_LABELS = {'1d': 'Diario', '1wk': 'Semanal', '1mo': 'Mensual', '3mo': 'Trimestral'}
+
+# Cómo se combina cada columna; ``starts`` son las posiciones donde empieza cada vela
+_REDUCERS = {
+    'Open': lambda values, starts: values[starts],
+    'High': np.maximum.reduceat,
+    'Low': np.minimum.reduceat,
+    'Close': lambda values, starts: values[np.r_[starts[1:], len(values)] - 1],
+    'Volume': np.add.reduceat,
+}
+
+
+def _periods(index, frequency):
+    naive = index.tz_localize(None) if index.tz is not None else index
+    return naive.to_period(frequency)
+
+
+# ============================
+# FUNCIÓN: Agrupar barras
+# ============================
+def resample_ohlcv(data, frequency):
+    """Agrupa las barras de ``data`` (ordenadas por fecha) por ``frequency``.
+
+    Se agregan las columnas OHLCV presentes; las demás se descartan.
+    """
+    if data.empty:
+        return data[[column for column in data.columns if column in _REDUCERS]]
+    periods = _periods(data.index, frequency).asi8
+    starts = np.flatnonzero(np.r_[True, periods[1:] != periods[:-1]])
+    bars = {}
+    for column, reduce in _REDUCERS.items():
+        if column in data.columns:
+            bars[column] = reduce(data[column].to_numpy(), starts)
+    return pd.DataFrame(bars, index=data.index[starts])
+
+
+# ============================
+# FUNCIÓN: Extender velas agrupadas
+# ============================
+def extend_rollup(bars, daily, frequency):
+    """Agrega a ``bars`` las barras diarias nuevas ``daily`` (posteriores a las ya agrupadas).
+
+    Si la primera barra nueva cae en el intervalo de la última vela, esa
+    vela se rehace combinándola con las nuevas; el resto de ``bars`` no se
+    toca.
+    """
+    if daily.empty:
+        return bars
+    fresh = resample_ohlcv(daily, frequency)
+    if bars.empty:
+        return fresh
+    last, first = _periods(bars.index[-1:], frequency), _periods(fresh.index[:1], frequency)
+    if last[0] != first[0]:
+        return pd.concat([bars, fresh])
+
+    merged = fresh.iloc[:1].copy()
+    merged.index = bars.index[-1:]
+    combine = {'Open': lambda old, new: old, 'High': max, 'Low': min,
+               'Close': lambda old, new: new, 'Volume': lambda old, new: old + new}
+    for column in merged.columns:
+        merged[column] = combine[column](bars[column].iloc[-1], merged[column].iloc[0])
+    return pd.concat([bars.iloc[:-1], merged, fresh.iloc[1:]])
@@ -0,0 +1,170 @@
+"""Actualización en segundo plano de los tickers más pedidos.
+
+Un hilo del proceso vuelve a descargar la historia de una lista de tickers
+(las tarjetas de cotizaciones más ``STOCK_REFRESH_TICKERS``) y precalcula
+sus indicadores y velas agrupadas, así la página casi siempre encuentra la
+caché caliente. El ritmo sigue al mercado de Nueva York: cada
+``interval`` segundos mientras está abierto, una vez ``after_close``
+después del cierre (cuando Stooq ya publicó la barra del día) y nada más
+hasta la apertura siguiente. No contempla feriados: esos días solo se
+hacen descargas que no cambian nada.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, time as clock, timedelta
+from zoneinfo import ZoneInfo
+
+from core import data
+from core.rollups import INTERVALS
+
+MARKET_TZ = ZoneInfo('America/New_York')
+MARKET_OPEN = clock(9, 30)
+MARKET_CLOSE = clock(16, 0)
+
+
+# ============================
+# CLASE: Planificador de actualizaciones
+# ============================
+class RefreshScheduler:
+    """Mantiene caliente la caché de ``tickers`` desde un hilo en segundo plano.
+
+    - ``interval``: segundos entre actualizaciones con el mercado abierto.
+    - ``after_close``: espera tras el cierre para la actualización del día.
+    - ``workers``: tickers que se actualizan a la vez.
+    """
+
+    def __init__(self, tickers, interval=900, after_close=timedelta(minutes=30), workers=4):
+        self.tickers = list(dict.fromkeys(ticker.upper() for ticker in tickers))
+        self.interval = interval
+        self.after_close = after_close
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._status = {'state': 'detenido', 'runs': 0, 'last_start': None, 'last_end': None,
+                        'last_seconds': None, 'next_run': None, 'tickers': {}}
+
+    def next_run(self, now=None):
+        """Próxima actualización a partir de ``now`` (con zona horaria)."""
+        now = (now or datetime.now(MARKET_TZ)).astimezone(MARKET_TZ)
+        interval = timedelta(seconds=self.interval)
+        for offset in range(8):
+            day = now.date() + timedelta(days=offset)
+            if day.weekday() >= 5:
+                continue
+            opens = datetime.combine(day, MARKET_OPEN, MARKET_TZ)
+            settles = datetime.combine(day, MARKET_CLOSE, MARKET_TZ) + self.after_close
+            if now < opens:
+                return opens
+            if now < settles:
+                return min(now + interval, settles)
+        return now + interval
+
+    def refresh(self, ticker, ttl=None):
+        """Descarga ``ticker`` de nuevo y precalcula indicadores y velas agrupadas."""
+        history = data.refresh_history(ticker, ttl)
+        if not history.empty:
+            # Lo precalculado vive tanto como la historia
+            data.get_indicators(ticker, ttl=ttl)
+            for interval in INTERVALS:
+                data.get_bars(ticker, interval, ttl)
+        return len(history)
+
+    def run_once(self):
+        """Actualiza todos los tickers (como mucho ``workers`` a la vez)."""
+        started = time.perf_counter()
+        now = datetime.now(MARKET_TZ)
+        with self._lock:
+            self._status.update(state='actualizando', last_start=now)
+        # La historia queda vigente hasta después de la próxima actualización
+        # (toda la noche o el fin de semana con el mercado cerrado)
+        ttl = (self.next_run(now) - now).total_seconds() + self.interval
+        with ThreadPoolExecutor(self.workers, thread_name_prefix='stock-refresh') as executor:
+            results = executor.map(lambda ticker: self._refresh_safely(ticker, ttl), self.tickers)
+            for ticker, result in zip(self.tickers, results):
+                with self._lock:
+                    self._status['tickers'][ticker] = result
+        with self._lock:
+            self._status.update(state='en espera', runs=self._status['runs'] + 1,
+                                last_end=datetime.now(MARKET_TZ),
+                                last_seconds=time.perf_counter() - started)
+
+    def _refresh_safely(self, ticker, ttl):
+        started = time.perf_counter()
+        try:
+            rows = self.refresh(ticker, ttl)
+            return {'ok': True, 'rows': rows, 'seconds': time.perf_counter() - started,
+                    'at': datetime.now(MARKET_TZ)}
+        except Exception as error:
+            return {'ok': False, 'error': str(error), 'seconds': time.perf_counter() - started,
+                    'at': datetime.now(MARKET_TZ)}
+
+    def start(self):
+        """Arranca el hilo (una actualización inmediata y después según ``next_run``)."""
+        with self._lock:
+            if self._thread is not None:
+                return self
+            self._thread = threading.Thread(target=self._loop, name='stock-scheduler', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._wake.set()
+            thread.join()
+            self._wake.clear()
+        with self._lock:
+            self._status.update(state='detenido', next_run=None)
+
+    def _loop(self):
+        current = threading.current_thread()
+        while self._thread is current:
+            self.run_once()
+            upcoming = self.next_run()
+            with self._lock:
+                self._status['next_run'] = upcoming
+            self._wake.wait(max((upcoming - datetime.now(MARKET_TZ)).total_seconds(), 1))
+
+    def status(self):
+        """Copia del estado: fase, corridas, tiempos y resultado por ticker."""
+        with self._lock:
+            status = dict(self._status)
+            status['tickers'] = dict(status['tickers'])
+        return status
+
+
+# ============================
+# FUNCIÓN: Planificador del proceso
+# ============================
+scheduler = None
+_start_lock = threading.Lock()
+
+
+def start_scheduler(tickers=()):
+    """Arranca (una sola vez por proceso) el planificador configurado por entorno.
+
+    Actualiza ``tickers`` más los de STOCK_REFRESH_TICKERS (separados por
+    coma) cada STOCK_REFRESH_INTERVAL segundos (0 lo desactiva), con
+    STOCK_REFRESH_AFTER_CLOSE minutos de espera tras el cierre y
+    STOCK_REFRESH_WORKERS descargas simultáneas. Devuelve el planificador o
+    ``None`` si está desactivado.
+    """
+    global scheduler
+    with _start_lock:
+        if scheduler is not None:
+            return scheduler
+        interval = int(os.environ.get('STOCK_REFRESH_INTERVAL', 900))
+        if interval <= 0:
+            return None
+        popular = [ticker.strip() for ticker in os.environ.get('STOCK_REFRESH_TICKERS', '').split(',')]
+        scheduler = RefreshScheduler(
+            list(tickers) + [ticker for ticker in popular if ticker],
+            interval=interval,
+            after_close=timedelta(minutes=int(os.environ.get('STOCK_REFRESH_AFTER_CLOSE', 30))),
+            workers=int(os.environ.get('STOCK_REFRESH_WORKERS', 4)),
+        ).start()
+        return scheduler
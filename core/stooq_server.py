@@ -0,0 +1,117 @@
+"""Servidor HTTP local que imita el endpoint de descarga de Stooq.
+
+Sirve ``/q/d/l/?s=<ticker>&i=d[&d1=AAAAMMDD&d2=AAAAMMDD]`` a partir de un
+proveedor local (sintético o carpeta de CSV), con latencia y fallas
+configurables, para medir y probar el dashboard sin internet::
+
+    python -m core.stooq_server --port 8765 --latency 0.2 --failure-rate 0.05
+    STOCK_DATA_PROVIDER=stooq:http://127.0.0.1:8765 streamlit run main.py
+"""
+import argparse
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+from core.providers import CSVDirectoryProvider, SyntheticProvider
+
+
+# ============================
+# CLASE: Servidor compatible con Stooq
+# ============================
+class StooqStandIn(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, provider, latency=0.0, jitter=0.0,
+                 failure_rate=0.0, seed=None):
+        super().__init__(address, _StooqHandler)
+        self.provider = provider
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+        self.requests = 0
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class _StooqHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        server.requests += 1
+        url = urlparse(self.path)
+        if url.path.rstrip('/') != '/q/d/l':
+            self._send(404, 'Not found')
+            return
+
+        delay = server.latency + server.random.uniform(0, server.jitter)
+        if delay > 0:
+            time.sleep(delay)
+        if server.random.random() < server.failure_rate:
+            self._send(503, 'Service unavailable')
+            return
+
+        query = parse_qs(url.query)
+        ticker = query.get('s', [''])[0]
+        data = server.provider.fetch(ticker) if ticker else pd.DataFrame()
+        if not data.empty and 'd1' in query:
+            data = data[data.index >= pd.to_datetime(query['d1'][0], format='%Y%m%d')]
+        if not data.empty and 'd2' in query:
+            data = data[data.index <= pd.to_datetime(query['d2'][0], format='%Y%m%d')]
+        if data.empty:
+            # Stooq responde 200 con este texto cuando no hay datos
+            self._send(200, 'No data')
+            return
+        self._send(200, data.to_csv(date_format='%Y-%m-%d'), 'text/csv')
+
+    def _send(self, status, body, content_type='text/plain'):
+        payload = body.encode()
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# ============================
+# FUNCIÓN: Levantar el servidor en segundo plano
+# ============================
+def start_server(provider=None, host='127.0.0.1', port=0, **options):
+    """Inicia el servidor en un hilo daemon y lo devuelve (``port=0`` = libre)."""
+    server = StooqStandIn((host, port), provider or SyntheticProvider(), **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--csv-dir', help='servir CSV de esta carpeta en lugar de datos sintéticos')
+    parser.add_argument('--seed', type=int, default=0, help='semilla de los datos sintéticos')
+    parser.add_argument('--latency', type=float, default=0.0, help='segundos de demora por respuesta')
+    parser.add_argument('--jitter', type=float, default=0.0, help='demora extra aleatoria máxima')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='fracción de respuestas 503')
+    args = parser.parse_args(argv)
+
+    provider = CSVDirectoryProvider(args.csv_dir) if args.csv_dir else SyntheticProvider(args.seed)
+    server = StooqStandIn((args.host, args.port), provider, latency=args.latency,
+                          jitter=args.jitter, failure_rate=args.failure_rate)
+    print(f"Sirviendo {provider!r} en {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+import json
+import os
+import threading
+from datetime import timedelta
+from pathlib import Path
+
+import pandas as pd
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def _ohlcv(data):
+    """Columnas OHLCV de ``data``; Volume puede faltar (``parse_stooq_csv`` lo acepta)."""
+    return data[[column for column in OHLCV_COLUMNS if column in data.columns]]
+
+
+# ============================
+# CLASE: Almacén OHLCV en disco
+# ============================
+class OHLCVStore:
+    """Historia diaria persistente en Parquet, una partición por ticker.
+
+    Cada ticker es un directorio ``<root>/<TICKER>/`` con archivos
+    ``part-00000.parquet``, ``part-00001.parquet``... Las actualizaciones
+    solo agregan partes nuevas; al leer, una fecha repetida en una parte
+    posterior reemplaza a la anterior. Cuando hay más de ``compact_after``
+    partes se reescriben en una sola.
+    """
+
+    def __init__(self, root, compact_after=32):
+        self.root = Path(root)
+        self.compact_after = compact_after
+        self._lock = threading.RLock()
+
+    def path(self, ticker):
+        return self.root / ticker.upper()
+
+    def parts(self, ticker):
+        directory = self.path(ticker)
+        if not directory.is_dir():
+            return []
+        return sorted(directory.glob('part-*.parquet'))
+
+    def read(self, ticker):
+        """Devuelve la historia guardada (vacía si no hay nada)."""
+        with self._lock:
+            parts = self.parts(ticker)
+            if not parts:
+                return pd.DataFrame()
+            frames = [pd.read_parquet(part) for part in parts]
+        data = frames[0] if len(frames) == 1 else pd.concat(frames)
+        data = data[~data.index.duplicated(keep='last')]
+        return data.sort_index()
+
+    def append(self, ticker, data):
+        """Agrega ``data`` como una parte nueva (escritura atómica)."""
+        if data.empty:
+            return
+        with self._lock:
+            directory = self.path(ticker)
+            directory.mkdir(parents=True, exist_ok=True)
+            parts = self.parts(ticker)
+            number = int(parts[-1].stem.split('-')[1]) + 1 if parts else 0
+            self._write(directory / f'part-{number:05d}.parquet', data)
+            if len(parts) + 1 > self.compact_after:
+                self._compact(ticker)
+
+    def save_indicators(self, ticker, frame, state):
+        """Guarda los indicadores de ``ticker`` y su estado incremental.
+
+        ``frame`` va a ``indicators.parquet`` y ``state`` (serializable en
+        JSON, ver ``core.streaming``) a ``indicators.json``, junto a las
+        partes de la historia.
+        """
+        with self._lock:
+            directory = self.path(ticker)
+            directory.mkdir(parents=True, exist_ok=True)
+            self._write(directory / 'indicators.parquet', frame)
+            path = directory / 'indicators.json'
+            tmp = path.with_suffix('.tmp')
+            tmp.write_text(json.dumps(state))
+            os.replace(tmp, path)
+
+    def load_indicators(self, ticker):
+        """Devuelve ``(frame, state)`` guardados con ``save_indicators`` o ``None``."""
+        directory = self.path(ticker)
+        with self._lock:
+            try:
+                state = json.loads((directory / 'indicators.json').read_text())
+                frame = pd.read_parquet(directory / 'indicators.parquet')
+            except (OSError, ValueError):
+                return None
+        return frame, state
+
+    def compact(self, ticker):
+        with self._lock:
+            self._compact(ticker)
+
+    def sync(self, ticker, fetch, overlap_days=7):
+        """Completa la historia guardada de ``ticker`` y la devuelve.
+
+        ``fetch(ticker, start)`` descarga desde ``start`` (``None`` = todo).
+        Solo se pide la cola desde la última fecha guardada menos
+        ``overlap_days`` (para tomar correcciones de las últimas barras) y se
+        agregan las filas nuevas o modificadas. Si la descarga falla y hay
+        datos guardados, se devuelven esos.
+        """
+        stored = self.read(ticker)
+        if stored.empty:
+            data = fetch(ticker, None)
+            self.append(ticker, _ohlcv(data) if not data.empty else data)
+            return data
+
+        start = stored.index[-1] - timedelta(days=overlap_days)
+        try:
+            tail = fetch(ticker, start)
+        except Exception:
+            return stored
+        if tail.empty:
+            return stored
+
+        tail = _ohlcv(tail)
+        overlap = tail.index.intersection(stored.index)
+        # Solo las columnas de ambos lados (p. ej. CSV sin Volume)
+        columns = [column for column in tail.columns if column in stored.columns]
+        old, new = stored.loc[overlap, columns], tail.loc[overlap, columns]
+        changed = (new.ne(old) & ~(new.isna() & old.isna())).any(axis=1)
+        updates = pd.concat([new[changed], tail[tail.index > stored.index[-1]]])
+        if updates.empty:
+            return stored
+
+        self.append(ticker, updates)
+        merged = pd.concat([stored, updates])
+        merged = merged[~merged.index.duplicated(keep='last')]
+        return merged.sort_index()
+
+    def _compact(self, ticker):
+        parts = self.parts(ticker)
+        if len(parts) <= 1:
+            return
+        data = self.read(ticker)
+        self._write(parts[0], data)
+        for part in parts[1:]:
+            part.unlink()
+
+    @staticmethod
+    def _write(path, data):
+        tmp = path.with_suffix('.tmp')
+        data.to_parquet(tmp)
+        os.replace(tmp, path)
+
+
+# ============================
+# FUNCIÓN: Almacén configurado por variables de entorno
+# ============================
+def store_from_env(default='data/store', subdir=''):
+    """Crea el almacén en ``STOCK_STORE_DIR/<subdir>``; vacío desactiva la persistencia."""
+    root = os.environ.get('STOCK_STORE_DIR', default)
+    return OHLCVStore(Path(root) / subdir) if root else None
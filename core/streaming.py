@@ -0,0 +1,445 @@
+"""Indicadores con estado que se actualizan en O(1) por barra nueva.
+
+Cada estado se inicializa desde la historia (``seed``) con el motor
+vectorizado de ``core.engine`` y después avanza una barra a la vez con
+``update``, dando los mismos valores que ``add_technical_indicators``. El
+estado completo se serializa con ``to_dict`` / ``from_dict`` (JSON) para
+guardarlo junto a la historia en ``core.store``.
+
+Un cierre faltante (NaN) sigue las mismas reglas que el motor y ``ta``: las
+ventanas que lo contienen dan NaN, la EMA repite su valor y deja decaer el
+peso del anterior (``pandas.ewm(adjust=False)``) y el RSI lo cuenta como
+movimiento 0.
+"""
+import math
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from core import engine
+
+NAN = float('nan')
+
+
+def _from_first_valid(values):
+    """``values`` desde su primer valor no NaN (los NaN iniciales son historia más corta)."""
+    values = np.asarray(values, dtype=np.float64)
+    valid = np.flatnonzero(~np.isnan(values))
+    return values[valid[0]:] if len(valid) else values[:0]
+
+
+# ============================
+# ESTADO: EMA
+# ============================
+class EMAState:
+    """``y = alpha * x + (1 - alpha) * y_prev``; NaN hasta ``min_periods`` valores.
+
+    ``weight`` es el peso de ``y_prev``: cada barra lo multiplica por
+    ``1 - alpha`` y un valor válido lo vuelve a 1, así que después de ``m``
+    faltantes ``y = (w * y_prev + alpha * x) / (w + alpha)`` con
+    ``w = (1 - alpha) ** (m + 1)``, igual que ``pandas.ewm(adjust=False)``.
+    """
+
+    def __init__(self, alpha, min_periods, value=None, count=0, weight=1.0):
+        self.alpha = alpha
+        self.min_periods = min_periods
+        self.value = value
+        self.count = count
+        self.weight = weight
+
+    @classmethod
+    def span(cls, window):
+        return cls(2.0 / (window + 1), window)
+
+    @property
+    def current(self):
+        return self.value if self.count >= self.min_periods else NAN
+
+    def update(self, x):
+        if self.value is None:
+            if not math.isnan(x):
+                self.value, self.count, self.weight = x, 1, 1.0
+            return self.current
+        self.weight *= 1 - self.alpha
+        if math.isnan(x):
+            return self.current
+        self.value = (self.weight * self.value + self.alpha * x) / (self.weight + self.alpha)
+        self.weight = 1.0
+        self.count += 1
+        return self.current
+
+    def seed(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        valid = np.flatnonzero(~np.isnan(values))
+        if len(valid):
+            self.value = float(engine.ewm(values, self.alpha)[-1])
+            self.count = len(valid)
+            self.weight = (1 - self.alpha) ** (len(values) - 1 - valid[-1])
+        return self
+
+    def to_dict(self):
+        return {'alpha': self.alpha, 'min_periods': self.min_periods,
+                'value': self.value, 'count': self.count, 'weight': self.weight}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(**state)
+
+
+# ============================
+# ESTADO: Ventana móvil (SMA / desvío)
+# ============================
+class RollingState:
+    """Suma y suma de cuadrados de las últimas ``window`` barras.
+
+    Las sumas se recalculan desde la ventana cada ``_RESYNC`` barras para que
+    el redondeo no se acumule.
+    """
+
+    _RESYNC = 1024
+
+    def __init__(self, window, values=(), updates=0):
+        self.window = window
+        self.values = deque(values, maxlen=window)
+        self.updates = updates
+        self._resync()
+
+    def _resync(self):
+        self.total = math.fsum(self.values)
+        self.squares = math.fsum(v * v for v in self.values)
+
+    def update(self, x):
+        if len(self.values) == self.window:
+            old = self.values[0]
+            self.total -= old
+            self.squares -= old * old
+        self.values.append(x)
+        self.total += x
+        self.squares += x * x
+        self.updates += 1
+        if self.updates % self._RESYNC == 0 or math.isnan(self.total):
+            self._resync()
+
+    @property
+    def full(self):
+        return len(self.values) == self.window and not math.isnan(self.total)
+
+    @property
+    def mean(self):
+        return self.total / self.window if self.full else NAN
+
+    @property
+    def std(self):
+        if not self.full:
+            return NAN
+        mean = self.total / self.window
+        return math.sqrt(max(self.squares / self.window - mean * mean, 0.0))
+
+    def seed(self, values):
+        for x in np.asarray(values, dtype=np.float64)[-self.window:]:
+            self.values.append(float(x))
+        self._resync()
+        return self
+
+    def to_dict(self):
+        return {'window': self.window, 'values': list(self.values), 'updates': self.updates}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(**state)
+
+
+# ============================
+# INDICADORES CON ESTADO
+# ============================
+class SMAStream:
+    def __init__(self, window=20, column='SMA_20', rolling=None):
+        self.column = column
+        self.rolling = rolling or RollingState(window)
+
+    def seed(self, data):
+        self.rolling.seed(data['Close'])
+        return self
+
+    def update(self, bar):
+        self.rolling.update(bar['Close'])
+        return {self.column: self.rolling.mean}
+
+    def to_dict(self):
+        return {'column': self.column, 'rolling': self.rolling.to_dict()}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(column=state['column'], rolling=RollingState.from_dict(state['rolling']))
+
+
+class EMAStream:
+    def __init__(self, window=20, column='EMA_20', ema=None):
+        self.column = column
+        self.ema = ema or EMAState.span(window)
+
+    def seed(self, data):
+        self.ema.seed(data['Close'])
+        return self
+
+    def update(self, bar):
+        return {self.column: self.ema.update(bar['Close'])}
+
+    def to_dict(self):
+        return {'column': self.column, 'ema': self.ema.to_dict()}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(column=state['column'], ema=EMAState.from_dict(state['ema']))
+
+
+class RSIStream:
+    """RSI con suavizado de Wilder (EMA con ``alpha = 1 / window``)."""
+
+    def __init__(self, window=14, column='RSI_14', up=None, down=None, previous=None):
+        self.column = column
+        self.up = up or EMAState(1.0 / window, window)
+        self.down = down or EMAState(1.0 / window, window)
+        self.previous = previous
+
+    def seed(self, data):
+        close = _from_first_valid(data['Close'])
+        if len(close):
+            # Como en el motor, un cierre faltante cuenta como movimiento 0
+            diff = np.nan_to_num(np.diff(close, prepend=close[0]), nan=0.0)
+            self.up.seed(np.maximum(diff, 0.0))
+            self.down.seed(np.maximum(-diff, 0.0))
+            self.previous = float(close[-1])
+        return self
+
+    def update(self, bar):
+        close = bar['Close']
+        if self.previous is None:
+            if math.isnan(close):
+                return {self.column: NAN}
+            diff = 0.0
+        else:
+            diff = close - self.previous
+            if math.isnan(diff):
+                diff = 0.0
+        self.previous = close
+        up = self.up.update(max(diff, 0.0))
+        down = self.down.update(max(-diff, 0.0))
+        if math.isnan(down):
+            value = NAN
+        elif down == 0:
+            value = 100.0
+        else:
+            value = 100.0 * up / (up + down)
+        return {self.column: value}
+
+    def to_dict(self):
+        return {'column': self.column, 'up': self.up.to_dict(),
+                'down': self.down.to_dict(), 'previous': self.previous}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(column=state['column'], up=EMAState.from_dict(state['up']),
+                   down=EMAState.from_dict(state['down']), previous=state['previous'])
+
+
+class MACDStream:
+    def __init__(self, fast=None, slow=None, signal=None):
+        self.fast = fast or EMAState.span(12)
+        self.slow = slow or EMAState.span(26)
+        self.signal = signal or EMAState.span(9)
+
+    def seed(self, data):
+        close = _from_first_valid(data['Close'])
+        self.fast.seed(close)
+        self.slow.seed(close)
+        if len(close):
+            line, _, _ = engine.macd(close)
+            self.signal.seed(line)
+        return self
+
+    def update(self, bar):
+        line = self.fast.update(bar['Close']) - self.slow.update(bar['Close'])
+        signal = self.signal.update(line)
+        return {'MACD': line, 'MACD_Signal': signal, 'MACD_Hist': line - signal}
+
+    def to_dict(self):
+        return {'fast': self.fast.to_dict(), 'slow': self.slow.to_dict(),
+                'signal': self.signal.to_dict()}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(**{name: EMAState.from_dict(value) for name, value in state.items()})
+
+
+class BollingerStream:
+    def __init__(self, window=20, window_dev=2, rolling=None):
+        self.window_dev = window_dev
+        self.rolling = rolling or RollingState(window)
+
+    def seed(self, data):
+        self.rolling.seed(data['Close'])
+        return self
+
+    def update(self, bar):
+        self.rolling.update(bar['Close'])
+        mean, width = self.rolling.mean, self.window_dev * self.rolling.std
+        return {'BB_High': mean + width, 'BB_Low': mean - width}
+
+    def to_dict(self):
+        return {'window_dev': self.window_dev, 'rolling': self.rolling.to_dict()}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(window_dev=state['window_dev'],
+                   rolling=RollingState.from_dict(state['rolling']))
+
+
+class StochasticStream:
+    """Mínimo/máximo móviles con colas monótonas: O(1) amortizado por barra."""
+
+    def __init__(self, window=14, smooth_window=3, count=0, lows=(), highs=(), ks=()):
+        self.window = window
+        self.count = count
+        self.lows = deque(tuple(item) for item in lows)    # (índice, low) crecientes
+        self.highs = deque(tuple(item) for item in highs)  # (índice, high) decrecientes
+        self.ks = deque(ks, maxlen=smooth_window)
+
+    def seed(self, data):
+        # Alcanza con las últimas barras que tocan la ventana y el suavizado;
+        # un cierre faltante queda (da %K NaN), como en el motor
+        bars = data[['High', 'Low', 'Close']].dropna(subset=['High', 'Low'])
+        tail = bars.tail(self.window + self.ks.maxlen - 1)
+        self.count = len(bars) - len(tail)
+        for high, low, close in tail.itertuples(index=False):
+            self.update({'High': high, 'Low': low, 'Close': close})
+        return self
+
+    def update(self, bar):
+        index = self.count
+        self.count += 1
+        while self.lows and self.lows[-1][1] >= bar['Low']:
+            self.lows.pop()
+        self.lows.append((index, bar['Low']))
+        while self.highs and self.highs[-1][1] <= bar['High']:
+            self.highs.pop()
+        self.highs.append((index, bar['High']))
+        while self.lows[0][0] <= index - self.window:
+            self.lows.popleft()
+        while self.highs[0][0] <= index - self.window:
+            self.highs.popleft()
+
+        k = NAN
+        if self.count >= self.window:
+            lowest, highest = self.lows[0][1], self.highs[0][1]
+            spread = highest - lowest
+            if spread != 0:
+                k = 100.0 * (bar['Close'] - lowest) / spread
+        self.ks.append(k)
+        full = len(self.ks) == self.ks.maxlen and not any(math.isnan(v) for v in self.ks)
+        return {'Stoch_%K': k, 'Stoch_%D': sum(self.ks) / len(self.ks) if full else NAN}
+
+    def to_dict(self):
+        return {'window': self.window, 'smooth_window': self.ks.maxlen, 'count': self.count,
+                'lows': list(self.lows), 'highs': list(self.highs), 'ks': list(self.ks)}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(**state)
+
+
+# Un estado por indicador del registro de core.indicators
+STREAMS = {
+    'SMA 20': SMAStream,
+    'EMA 20': EMAStream,
+    'RSI 14': RSIStream,
+    'MACD': MACDStream,
+    'Bollinger Bands': BollingerStream,
+    'Stochastic Oscillator': StochasticStream,
+}
+
+
+# ============================
+# FUNCIÓN: Barras nuevas de una historia
+# ============================
+def new_bars(data, last_date, last_close):
+    """Barras de ``data`` posteriores a ``last_date``.
+
+    Devuelve ``None`` si ``data`` no continúa lo ya procesado: falta
+    ``last_date`` o su cierre ya no es ``last_close`` (historia ajustada).
+    """
+    if last_date is None:
+        return None
+    position = data.index.searchsorted(last_date)
+    if position == len(data) or data.index[position] != last_date:
+        return None
+    if data['Close'].iloc[position] != last_close:
+        return None
+    return data.iloc[position + 1:]
+
+
+# ============================
+# CLASE: Conjunto de indicadores con estado
+# ============================
+class IndicatorStream:
+    """Estados de varios indicadores para un ticker, hasta la fecha ``last_date``.
+
+    ``last_close`` es el cierre de esa barra: si la historia cambia hacia
+    atrás (p. ej. un ajuste por split) deja de coincidir y ``new_bars``
+    devuelve ``None`` para forzar un recálculo completo.
+    """
+
+    def __init__(self, streams, last_date=None, last_close=None):
+        self.streams = streams
+        self.last_date = last_date
+        self.last_close = last_close
+
+    @property
+    def names(self):
+        return list(self.streams)
+
+    @classmethod
+    def from_history(cls, data, names):
+        """Inicializa los estados de ``names`` con toda la historia ``data``."""
+        streams = {name: STREAMS[name]().seed(data) for name in names}
+        stream = cls(streams)
+        stream._advance(data)
+        return stream
+
+    def new_bars(self, data):
+        """Barras de ``data`` posteriores a ``last_date``, o ``None`` si no continúan el estado."""
+        return new_bars(data, self.last_date, self.last_close)
+
+    def update(self, bar):
+        """Avanza una barra (mapping con High, Low y Close) y devuelve sus valores."""
+        values = {}
+        for stream in self.streams.values():
+            values.update(stream.update(bar))
+        return values
+
+    def extend(self, bars):
+        """Avanza todas las barras de ``bars`` y devuelve sus indicadores."""
+        rows = [self.update(bar) for bar in bars[['High', 'Low', 'Close']].to_dict('records')]
+        self._advance(bars)
+        return pd.DataFrame(rows, index=bars.index)
+
+    def _advance(self, bars):
+        if len(bars):
+            self.last_date = bars.index[-1]
+            self.last_close = float(bars['Close'].iloc[-1])
+
+    def to_dict(self):
+        return {
+            'last_date': None if self.last_date is None else self.last_date.isoformat(),
+            'last_close': self.last_close,
+            'streams': {name: stream.to_dict() for name, stream in self.streams.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        streams = {name: STREAMS[name].from_dict(value)
+                   for name, value in state['streams'].items()}
+        last_date = state['last_date']
+        return cls(streams, None if last_date is None else pd.Timestamp(last_date),
+                   state.get('last_close'))
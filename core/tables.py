@@ -0,0 +1,65 @@
+"""Tablas paginadas: filtrar, ordenar y recortar en el servidor.
+
+Al navegador solo viaja la página visible. El orden por fecha (la tabla ya
+está ordenada) se resuelve con posiciones invertidas en lugar de copiar el
+DataFrame ordenado; el filtro de fechas es una búsqueda binaria.
+"""
+import io
+
+import numpy as np
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+
+# ============================
+# FUNCIÓN: Filtrar por fechas
+# ============================
+def filter_dates(frame, start=None, end=None, date_column='Datetime'):
+    """Filas de ``frame`` (ordenado por ``date_column``) entre ``start`` y ``end`` inclusive."""
+    # Días desde 1970 (datetime64[D]): la búsqueda compara enteros
+    days = frame[date_column].to_numpy(dtype='datetime64[D]')
+    lo = 0 if start is None else days.searchsorted(np.datetime64(start, 'D'), side='left')
+    hi = len(frame) if end is None else days.searchsorted(np.datetime64(end, 'D'), side='right')
+    return frame.iloc[lo:hi]
+
+
+# ============================
+# FUNCIÓN: Página de una tabla
+# ============================
+def page_positions(frame, page, page_size, sort_by=None, descending=True):
+    """Posiciones (``iloc``) de las filas de la página ``page`` (desde 0).
+
+    Sin ``sort_by`` se respeta el orden de ``frame`` (por fecha); el orden
+    descendente son posiciones contadas desde el final, sin copiar nada.
+    """
+    n = len(frame)
+    lo, hi = min(page * page_size, n), min((page + 1) * page_size, n)
+    if sort_by is None:
+        positions = np.arange(lo, hi)
+        return n - 1 - positions if descending else positions
+    values = frame[sort_by].to_numpy()
+    # Orden estable; los NaN quedan al final en ambos sentidos
+    order = np.argsort(-values if descending else values, kind='stable')
+    return order[lo:hi]
+
+
+def page_count(rows, page_size):
+    return max(1, -(-rows // page_size))
+
+
+# ============================
+# FUNCIÓN: Descarga en CSV
+# ============================
+def csv_file(frame, chunk_rows=50_000, date_format=None):
+    """Contenido de ``frame`` como CSV (``bytes``), escrito por tramos.
+
+    Se arma recién cuando se pide la descarga; Streamlit guarda el archivo
+    entero en memoria para servirlo. Las fechas se formatean por tramo con
+    ``date_format``.
+    """
+    buffer = io.BytesIO()
+    for start in range(0, max(len(frame), 1), chunk_rows):
+        chunk = frame.iloc[start:start + chunk_rows]
+        csv = chunk.to_csv(header=start == 0, index=False, date_format=date_format)
+        buffer.write(csv.encode('utf-8'))
+    return buffer.getvalue()
@@ -0,0 +1,174 @@
+"""Tiempos por etapa de cada ejecución de la página.
+
+``start_trace`` abre el registro de una ejecución (con el ticker, período,
+etc. que sirvan para correlacionar) y ``span('etapa')`` mide un tramo de
+código: red, lectura del CSV, indicadores, figuras, tablas... Fuera de una
+ejecución registrada ``span`` no hace nada, así que ``core`` puede medirse
+siempre sin costo para el planificador ni los benchmarks.
+
+``finish_trace`` cierra la ejecución, suma sus tiempos a las ventanas
+móviles del proceso (p50/p95/p99 por etapa) y escribe una línea JSON en el
+logger ``stock.timing``: a stderr por defecto, a un archivo con
+STOCK_TIMING_LOG=<ruta> o a ninguna parte con STOCK_TIMING_LOG vacío. Cada
+STOCK_TIMING_SUMMARY_EVERY ejecuciones (por defecto 100) se agrega una
+línea con los percentiles.
+"""
+import contextvars
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+
+PERCENTILES = (50, 95, 99)
+
+logger = logging.getLogger('stock.timing')
+
+_current = contextvars.ContextVar('stock_timing_trace', default=None)
+# Profundidad de anidamiento; propia de cada hilo que copia el contexto
+_depth = contextvars.ContextVar('stock_timing_depth', default=0)
+
+
+# ============================
+# CLASE: Registro de una ejecución
+# ============================
+class Trace:
+    """Tramos medidos en una ejecución: ``(etapa, profundidad, inicio, segundos)``.
+
+    ``inicio`` es relativo al comienzo de la ejecución; los tramos se guardan
+    en orden de cierre (``timeline`` los ordena por inicio).
+    """
+
+    def __init__(self, page, **context):
+        self.page = page
+        self.context = context
+        self.spans = []
+        self.started = time.perf_counter()
+        self.total = None
+        self._lock = threading.Lock()
+
+    def add(self, name, depth, start, seconds):
+        if self.total is None:
+            with self._lock:
+                self.spans.append((name, depth, start - self.started, seconds))
+
+    def timeline(self):
+        return sorted(self.spans, key=lambda item: item[2])
+
+    def stages(self):
+        """Segundos por etapa (sumando las que se repiten, p. ej. dos tablas)."""
+        totals = {}
+        for name, _, _, seconds in self.spans:
+            totals[name] = totals.get(name, 0.0) + seconds
+        return totals
+
+
+@contextmanager
+def span(name):
+    """Mide el bloque como la etapa ``name`` de la ejecución en curso (si hay una)."""
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    depth = _depth.get()
+    token = _depth.set(depth + 1)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _depth.reset(token)
+        trace.add(name, depth, start, time.perf_counter() - start)
+
+
+def start_trace(page, **context):
+    """Empieza a registrar una ejecución de ``page`` en este hilo."""
+    trace = Trace(page, **context)
+    _current.set(trace)
+    return trace
+
+
+def finish_trace(trace):
+    """Cierra ``trace``: lo suma a las ventanas móviles y escribe su línea de log."""
+    if trace.total is not None:
+        return trace
+    trace.total = time.perf_counter() - trace.started
+    if _current.get() is trace:
+        _current.set(None)
+    stages = trace.stages()
+    runs = stats.record(trace.total, stages)
+    _log({
+        'evento': 'ejecucion',
+        'momento': datetime.now().astimezone().isoformat(timespec='milliseconds'),
+        'pagina': trace.page,
+        **trace.context,
+        'total_ms': round(trace.total * 1000, 2),
+        'etapas_ms': {name: round(seconds * 1000, 2) for name, seconds in stages.items()},
+    })
+    if SUMMARY_EVERY and runs % SUMMARY_EVERY == 0:
+        _log({'evento': 'percentiles', 'pagina': trace.page, 'ejecuciones': runs,
+              'etapas_ms': stats.percentiles()})
+    return trace
+
+
+# ============================
+# CLASE: Percentiles móviles
+# ============================
+class RollingStats:
+    """Últimos ``window`` tiempos de cada etapa (y del total) para sacar percentiles."""
+
+    def __init__(self, window=1000):
+        self.window = window
+        self._samples = {}
+        self._runs = 0
+        self._lock = threading.Lock()
+
+    def record(self, total, stages):
+        """Suma una ejecución; devuelve cuántas lleva registradas el proceso."""
+        with self._lock:
+            self._runs += 1
+            for name, seconds in {'total': total, **stages}.items():
+                self._samples.setdefault(name, deque(maxlen=self.window)).append(seconds)
+            return self._runs
+
+    def percentiles(self):
+        """``{etapa: {'n', 'p50', 'p95', 'p99'}}`` en milisegundos."""
+        with self._lock:
+            samples = {name: np.fromiter(values, float) for name, values in self._samples.items()}
+        summary = {}
+        for name, values in samples.items():
+            points = np.percentile(values, PERCENTILES) * 1000
+            summary[name] = {'n': len(values),
+                             **{f'p{p}': round(float(v), 2) for p, v in zip(PERCENTILES, points)}}
+        return summary
+
+
+stats = RollingStats(int(os.environ.get('STOCK_TIMING_WINDOW', 1000)))
+SUMMARY_EVERY = int(os.environ.get('STOCK_TIMING_SUMMARY_EVERY', 100))
+
+
+# ============================
+# FUNCIÓN: Líneas de log en JSON
+# ============================
+def _configure_logger():
+    target = os.environ.get('STOCK_TIMING_LOG', '-')
+    if logger.handlers or not target:
+        return
+    handler = logging.StreamHandler(sys.stderr) if target == '-' else logging.FileHandler(target)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def _log(record):
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps(record, ensure_ascii=False, default=str))
+
+
+_configure_logger()
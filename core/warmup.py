@@ -0,0 +1,119 @@
+"""Precalentamiento del proceso antes de la primera sesión.
+
+La primera visita a ``pages/app.py`` en un proceso nuevo paga importar
+pandas, Plotly y ``core``, cargar los validadores de Plotly al crear la
+primera figura y las primeras llamadas de NumPy. ``prewarm`` hace todo eso
+con datos sintéticos (sin red) para que lo pague el arranque y no el primer
+usuario. Hay dos formas de usarlo:
+
+- ``python -m core.warmup [argumentos de streamlit run]`` precalienta y
+  recién después levanta el servidor (``serve.py``; pensado para réplicas
+  nuevas tras un despliegue: la réplica acepta conexiones ya caliente);
+- ``prewarm_in_background()`` lo corre en un hilo desde ``main.py``
+  mientras el usuario mira la intro (STOCK_PREWARM=0 lo desactiva).
+
+Este módulo solo importa la biblioteca estándar: importarlo no cuesta nada.
+"""
+import os
+import sys
+import threading
+import time
+
+_started = threading.Event()
+
+
+# ============================
+# FUNCIÓN: Precalentar
+# ============================
+def prewarm(rows=400):
+    """Importa los módulos pesados y arma una vista de prueba; devuelve los tiempos por etapa."""
+    timings = {}
+
+    def stage(name, action):
+        start = time.perf_counter()
+        action()
+        timings[name] = time.perf_counter() - start
+
+    stage('core', lambda: __import__('core.data'))
+    stage('plotly', _import_plotly)
+    stage('figures', _build_figures)
+    stage('indicators', lambda: _compute_indicators(rows))
+    return timings
+
+
+def _import_plotly():
+    import plotly.express  # noqa: F401
+    import plotly.graph_objects  # noqa: F401
+    import plotly.io  # noqa: F401
+    import plotly.subplots  # noqa: F401
+
+
+def _build_figures():
+    # Cada tipo de traza carga sus validadores la primera vez que se usa
+    import plotly.express as px
+    import plotly.graph_objects as go
+    import plotly.io
+    from plotly.subplots import make_subplots
+
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True, subplot_titles=['', 'RSI'])
+    fig.add_trace(go.Candlestick(x=[0, 1], open=[1, 2], high=[2, 3], low=[0, 1], close=[2, 1]),
+                  row=1, col=1)
+    fig.add_trace(go.Scattergl(x=[0, 1], y=[1, 2], line=dict(color='blue')), row=1, col=1)
+    fig.add_trace(go.Bar(x=[0, 1], y=[1, 2], marker_color='gray'), row=2, col=1)
+    fig.add_trace(go.Scatter(x=[0, 1], y=[1, 2], line=dict(dash='dot')), row=2, col=1)
+    fig.add_hline(y=1, line_dash='dash', row=2, col=1)
+    fig.update_layout(title='warmup', xaxis_rangeslider_visible=False)
+    fig.update_xaxes(type='date')
+    plotly.io.to_json(fig, validate=False)
+    plotly.io.to_json(px.line(x=[0, 1], y=[1, 2]), validate=False)
+
+
+def _compute_indicators(rows):
+    from core.indicators import INDICATORS, add_technical_indicators
+    from core.lod import aggregate_ohlc, decimate
+    from core.providers import synthetic_ohlcv
+    from core.rollups import resample_ohlcv
+    from core.streaming import IndicatorStream
+
+    data = synthetic_ohlcv(rows)
+    frame = add_technical_indicators(data)
+    IndicatorStream.from_history(data, list(INDICATORS))
+    resample_ohlcv(data, 'W')
+    table = frame.rename_axis('Datetime').reset_index()
+    decimate(table, 'Datetime', 'Close', rows // 4)
+    aggregate_ohlc(table, rows // 4)
+
+
+def prewarm_in_background():
+    """Lanza ``prewarm`` en un hilo (una sola vez por proceso) salvo con STOCK_PREWARM=0."""
+    if os.environ.get('STOCK_PREWARM', '1') == '0' or _started.is_set():
+        return
+    _started.set()
+    threading.Thread(target=_prewarm_safely, name='stock-prewarm', daemon=True).start()
+
+
+def _prewarm_safely():
+    try:
+        prewarm()
+    except Exception as error:
+        print(f"Precalentamiento fallido: {error}", file=sys.stderr)
+
+
+# ============================
+# FUNCIÓN: Arrancar el servidor precalentado
+# ============================
+def main(argv=None):
+    """Precalienta y ejecuta ``streamlit run serve.py`` con los argumentos dados."""
+    argv = sys.argv[1:] if argv is None else list(argv)
+    timings = prewarm()
+    _started.set()
+    print('Precalentado: ' + ', '.join(f'{name} {seconds * 1000:.0f} ms'
+                                       for name, seconds in timings.items()), file=sys.stderr)
+    from streamlit.web import cli
+
+    sys.argv = ['streamlit', 'run', 'serve.py', *argv]
+    sys.exit(cli.main())
+
+
+if __name__ == '__main__':
+    main()
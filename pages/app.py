@@ -1,33 +1,40 @@
+import json
+import os
+import uuid
+from datetime import datetime
+
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
 import pandas as pd
-from datetime import datetime, timedelta
-import ta
+
+from core.compute import MAX_COMPARE, PERIODS, align_closes, calculate_metrics, cumulative_returns
+from core.data import (data_version, fetch_many, get_indicators, get_period_bars,
+                       history_version, view_cache)
+from core.indicators import INDICATORS, indicator_columns
+from core.lod import (OHLC_LABELS, POINT_BUDGET, WEBGL_POINTS, aggregate_ohlc, decimate, epoch_ms,
+                      stride_indices)
+from core.periods import slice_period
+from core.profiling import recorder
+from core.rollups import INTERVAL_LABELS
+from core.scheduler import start_scheduler
+from core.tables import PAGE_SIZES, csv_file, filter_dates, page_count, page_positions
+from core.timing import finish_trace, span, start_trace, stats
 
 # ============================
 # FUNCIÓN: Descargar datos
 # ============================
-def fetch_stock_data(ticker, period):
+def fetch_stock_data(ticker, period, interval='1d'):
     try:
-        url = f"https://stooq.com/q/d/l/?s={ticker.lower()}&i=d"
-        data = pd.read_csv(url)
+        # La historia completa se descarga una vez y se comparte entre
+        # sesiones (core.data.history_cache); cada período es un recorte.
+        # Las velas semanales/mensuales/trimestrales de "max" se agrupan una
+        # vez por ticker (core.data.rollup_cache); los demás períodos se
+        # recortan en barras diarias antes de agrupar.
+        data = get_period_bars(ticker, period, interval)
 
         if data.empty:
             st.warning(f"No se encontraron datos para {ticker} en Stooq.")
             return pd.DataFrame()
 
-        data['Date'] = pd.to_datetime(data['Date'])
-        data.set_index('Date', inplace=True)
-        data = data.sort_index()
-
-        # Calcular fechas según período
-        end_date = datetime.now()
-        periods = {'5d': 5, '1mo': 30, '3mo': 90, '6mo': 180, '1y': 365}
-        days = periods.get(period, 9000)  # "max" = 9000 días
-        start_date = end_date - timedelta(days=days)
-        data = data[data.index >= start_date]
-
         return data
 
     except Exception as e:
@@ -40,65 +47,375 @@ def fetch_stock_data(ticker, period):
 def process_data(data):
     if data.empty:
         return data
-    data.index = pd.to_datetime(data.index).tz_localize('UTC').tz_convert('US/Eastern')
-    data.reset_index(inplace=True)
-    data.rename(columns={'Date': 'Datetime'}, inplace=True)
-    return data
+    # Barras diarias: la fecha no tiene hora, así que no hace falta zona
+    # horaria; queda como datetime64 (un int64 por fila) y se formatea
+    # recién al mostrarla. ``data`` puede ser la historia compartida de la
+    # caché (período "max"): se devuelve un DataFrame nuevo, sin tocarla
+    return data.reset_index().rename(columns={'Date': 'Datetime'})
 
 
 # ============================
-# FUNCIÓN: Calcular métricas
+# FUNCIÓN: Gráficos separados
 # ============================
-def calculate_metrics(data):
-    if data.empty:
-        return 0, 0, 0, 0, 0, 0
-    last_close = data['Close'].iloc[-1]
-    prev_close = data['Close'].iloc[0]
-    change = last_close - prev_close
-    pct_change = (change / prev_close) * 100 if prev_close != 0 else 0
-    high = data['High'].max()
-    low = data['Low'].min()
-    volume = data['Volume'].sum() if 'Volume' in data.columns else 0
-    return last_close, change, pct_change, high, low, volume
+def separate_figures(data, series, budget, title, ticker, chart_type, indicators):
+    """Precio, RSI, MACD y Stochastic como figuras independientes (SVG)."""
+    # Plotly se importa recién al armar la primera figura: las tarjetas y
+    # los controles se muestran sin esperarlo (ver core.warmup)
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    # ====== GRÁFICO PRINCIPAL ======
+    figures = []
+    fig = go.Figure()
+
+    if chart_type == 'Candlestick':
+        candles, frequency = aggregate_ohlc(data, budget)
+        if frequency:
+            title += f' · velas {OHLC_LABELS[frequency]}'
+        fig.add_trace(go.Candlestick(
+            x=candles['Datetime'],
+            open=candles['Open'],
+            high=candles['High'],
+            low=candles['Low'],
+            close=candles['Close'],
+            name='Precio'
+        ))
+    else:
+        fig = px.line(series('Close'), x='Datetime', y='Close', title=f"{ticker} Price Chart")
+
+    # Añadir indicadores técnicos
+    for indicator in indicators:
+        if indicator == 'SMA 20':
+            sma = series('SMA_20')
+            fig.add_trace(go.Scatter(x=sma['Datetime'], y=sma['SMA_20'], name='SMA 20', line=dict(color='blue')))
+        elif indicator == 'EMA 20':
+            ema = series('EMA_20')
+            fig.add_trace(go.Scatter(x=ema['Datetime'], y=ema['EMA_20'], name='EMA 20', line=dict(color='orange')))
+        elif indicator == 'Bollinger Bands':
+            bb_high, bb_low = series('BB_High'), series('BB_Low')
+            fig.add_trace(go.Scatter(x=bb_high['Datetime'], y=bb_high['BB_High'], name='BB Superior', line=dict(color='gray', dash='dot')))
+            fig.add_trace(go.Scatter(x=bb_low['Datetime'], y=bb_low['BB_Low'], name='BB Inferior', line=dict(color='gray', dash='dot')))
+
+    fig.update_layout(
+        title=title,
+        xaxis_title='Fecha',
+        yaxis_title='Precio (USD)',
+        height=600,
+        xaxis_rangeslider_visible=False
+    )
 
+    figures.append(fig)
+
+    # ====== SUBGRÁFICOS RSI y MACD ======
+    if 'RSI 14' in indicators:
+        fig_rsi = px.line(series('RSI_14'), x='Datetime', y='RSI_14', title='RSI (14)')
+        fig_rsi.add_hline(y=70, line_dash="dash", line_color="red")
+        fig_rsi.add_hline(y=30, line_dash="dash", line_color="green")
+        figures.append(fig_rsi)
 
+    if 'MACD' in indicators:
+        macd, macd_signal, macd_hist = series('MACD'), series('MACD_Signal'), series('MACD_Hist', 'minmax')
+        fig_macd = go.Figure()
+        fig_macd.add_trace(go.Scatter(x=macd['Datetime'], y=macd['MACD'], name='MACD', line=dict(color='blue')))
+        fig_macd.add_trace(go.Scatter(x=macd_signal['Datetime'], y=macd_signal['MACD_Signal'], name='Señal', line=dict(color='orange')))
+        fig_macd.add_trace(go.Bar(x=macd_hist['Datetime'], y=macd_hist['MACD_Hist'], name='Histograma', marker_color='gray'))
+        fig_macd.update_layout(title='MACD', height=300)
+        figures.append(fig_macd)
+
+    # ====== SUBGRÁFICO STOCHASTIC OSCILLATOR ======
+    if 'Stochastic Oscillator' in indicators:
+        stoch_k, stoch_d = series('Stoch_%K'), series('Stoch_%D')
+        fig_stoch = go.Figure()
+        fig_stoch.add_trace(go.Scatter(
+            x=stoch_k['Datetime'], y=stoch_k['Stoch_%K'], name='%K', line=dict(color='blue')
+        ))
+        fig_stoch.add_trace(go.Scatter(
+            x=stoch_d['Datetime'], y=stoch_d['Stoch_%D'], name='%D', line=dict(color='orange')
+        ))
+        fig_stoch.add_hline(y=80, line_dash="dash", line_color="red")
+        fig_stoch.add_hline(y=20, line_dash="dash", line_color="green")
+        fig_stoch.update_layout(title='Stochastic Oscillator', height=300)
+        figures.append(fig_stoch)
+
+    return figures
+
+
+# ============================
+# FUNCIÓN: Gráfico combinado
 # ============================
-# FUNCIÓN: Indicadores técnicos
+def combined_figure(data, series, budget, title, chart_type, indicators):
+    """Precio y osciladores en una sola figura con el eje de fechas compartido.
+
+    Las líneas son WebGL (``Scattergl``) y las fechas viajan como
+    milisegundos en binario; zoom y desplazamiento quedan sincronizados
+    entre paneles.
+    """
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    panels = [name for name in ('RSI 14', 'MACD', 'Stochastic Oscillator') if name in indicators]
+    titles = {'RSI 14': 'RSI (14)', 'MACD': 'MACD', 'Stochastic Oscillator': 'Stochastic Oscillator'}
+    fig = make_subplots(
+        rows=1 + len(panels), cols=1, shared_xaxes=True, vertical_spacing=0.04,
+        row_heights=[2] + [1] * len(panels), subplot_titles=[''] + [titles[name] for name in panels]
+    )
+
+    def line(column, name, color, row=1, dash=None):
+        points = series(column)
+        fig.add_trace(go.Scattergl(
+            x=epoch_ms(points['Datetime']), y=points[column], name=name,
+            line=dict(color=color, dash=dash)
+        ), row=row, col=1)
+
+    if chart_type == 'Candlestick':
+        candles, frequency = aggregate_ohlc(data, budget)
+        if frequency:
+            title += f' · velas {OHLC_LABELS[frequency]}'
+        fig.add_trace(go.Candlestick(
+            x=epoch_ms(candles['Datetime']),
+            open=candles['Open'],
+            high=candles['High'],
+            low=candles['Low'],
+            close=candles['Close'],
+            name='Precio'
+        ), row=1, col=1)
+    else:
+        line('Close', 'Precio', '#636efa')
+
+    if 'SMA 20' in indicators:
+        line('SMA_20', 'SMA 20', 'blue')
+    if 'EMA 20' in indicators:
+        line('EMA_20', 'EMA 20', 'orange')
+    if 'Bollinger Bands' in indicators:
+        line('BB_High', 'BB Superior', 'gray', dash='dot')
+        line('BB_Low', 'BB Inferior', 'gray', dash='dot')
+
+    for row, name in enumerate(panels, start=2):
+        if name == 'RSI 14':
+            line('RSI_14', 'RSI 14', '#636efa', row)
+            fig.add_hline(y=70, line_dash="dash", line_color="red", row=row, col=1)
+            fig.add_hline(y=30, line_dash="dash", line_color="green", row=row, col=1)
+        elif name == 'MACD':
+            line('MACD', 'MACD', 'blue', row)
+            line('MACD_Signal', 'Señal', 'orange', row)
+            hist = series('MACD_Hist', 'minmax')
+            fig.add_trace(go.Bar(
+                x=epoch_ms(hist['Datetime']), y=hist['MACD_Hist'], name='Histograma', marker_color='gray'
+            ), row=row, col=1)
+        else:
+            line('Stoch_%K', '%K', 'blue', row)
+            line('Stoch_%D', '%D', 'orange', row)
+            fig.add_hline(y=80, line_dash="dash", line_color="red", row=row, col=1)
+            fig.add_hline(y=20, line_dash="dash", line_color="green", row=row, col=1)
+
+    fig.update_xaxes(type='date', rangeslider_visible=False)
+    fig.update_xaxes(title_text='Fecha', row=1 + len(panels), col=1)
+    fig.update_yaxes(title_text='Precio (USD)', row=1, col=1)
+    fig.update_layout(title=title, height=600 + 250 * len(panels), hovermode='x unified')
+    return fig
+
+
+# ============================
+# FUNCIÓN: Gráfico de comparación
+# ============================
+def comparison_figure(returns, budget, title):
+    """Rendimiento acumulado de cada ticker (columnas de ``returns``) superpuesto.
+
+    Con más de ``budget`` fechas se conservan fechas equiespaciadas, las
+    mismas para todos los tickers; desde ``WEBGL_POINTS`` puntos en total
+    las líneas son WebGL (``Scattergl``).
+    """
+    import plotly.graph_objects as go
+
+    if budget is not None:
+        returns = returns.iloc[stride_indices(len(returns), budget)]
+    trace = go.Scattergl if returns.size >= WEBGL_POINTS else go.Scatter
+    x = epoch_ms(returns.index)
+    values = returns.to_numpy()
+    fig = go.Figure([
+        trace(x=x, y=values[:, position], name=ticker, mode='lines')
+        for position, ticker in enumerate(returns.columns)
+    ])
+    fig.add_hline(y=0, line_dash="dot", line_color="gray")
+    fig.update_xaxes(type='date', title_text='Fecha')
+    fig.update_yaxes(title_text='Rendimiento acumulado', ticksuffix='%')
+    fig.update_layout(title=title, height=600, hovermode='closest')
+    return fig
+
+
+def build_comparison(histories, period):
+    """Figura (JSON) y rendimiento final de cada ticker; ``None`` si no hay datos."""
+    # Un solo join por fecha y el rendimiento como operación sobre la matriz
+    returns = cumulative_returns(align_closes(histories, period)).dropna(axis=1, how='all')
+    if returns.empty:
+        return None
+
+    import plotly.io
+
+    figure = comparison_figure(returns, POINT_BUDGET, f'Rendimiento acumulado ({period})')
+    final = returns.ffill().iloc[-1].sort_values(ascending=False)
+    return {
+        'figure': plotly.io.to_json(figure, validate=False),
+        'summary': pd.DataFrame({'Ticker': final.index, 'Rendimiento (%)': final.round(2).to_numpy()}),
+    }
+
+
 # ============================
-def add_technical_indicators(data):
+# FUNCIÓN: Armar la vista
+# ============================
+def build_view(ticker, time_period, interval, chart_type, indicators, full_resolution,
+               combined=True):
+    """Métricas, figuras (JSON) y tablas de la vista; ``None`` si no hay datos."""
+    with span('historia'):
+        data = fetch_stock_data(ticker, time_period, interval)
+    if not data.empty and indicators:
+        # Indicadores sobre toda la historia (solo los elegidos); con una
+        # barra nueva se actualizan en O(1) en lugar de recalcularse
+        with span('indicadores'):
+            values = get_indicators(ticker, indicators, interval)
+            if interval != '1d':
+                # La primera vela del período puede empezar después que la vela
+                # completa sobre la que se calcularon los indicadores
+                values = values.reindex(data.index, method='ffill')
+            data = data.join(values)
+    data = process_data(data)
+
     if data.empty:
-        return data
+        return None
+
+    # ====== NIVEL DE DETALLE ======
+    # Por encima del presupuesto de puntos, las líneas se reducen con LTTB,
+    # las barras con mínimo/máximo y las velas se agrupan por semana/mes
+    budget = None if full_resolution else POINT_BUDGET
+
+    def series(column, method='lttb'):
+        return decimate(data, 'Datetime', column, budget, method)
+
+    title = f'{ticker} ({time_period})'
+    if interval != '1d':
+        title = f'{ticker} ({time_period}, {INTERVAL_LABELS[interval].lower()})'
+
+    with span('figuras'):
+        if combined:
+            figures = [combined_figure(data, series, budget, title, chart_type, indicators)]
+        else:
+            figures = separate_figures(data, series, budget, title, ticker, chart_type, indicators)
+
+    import plotly.io
+
+    with span('json'):
+        specs = [plotly.io.to_json(figure, validate=False) for figure in figures]
 
-    # SMA y EMA
-    data['SMA_20'] = ta.trend.sma_indicator(data['Close'], window=20)
-    data['EMA_20'] = ta.trend.ema_indicator(data['Close'], window=20)
-
-    # RSI
-    data['RSI_14'] = ta.momentum.rsi(data['Close'], window=14)
-
-    # MACD
-    macd = ta.trend.MACD(data['Close'])
-    data['MACD'] = macd.macd()
-    data['MACD_Signal'] = macd.macd_signal()
-    data['MACD_Hist'] = macd.macd_diff()
-
-    # Bollinger Bands
-    boll = ta.volatility.BollingerBands(data['Close'], window=20, window_dev=2)
-    data['BB_High'] = boll.bollinger_hband()
-    data['BB_Low'] = boll.bollinger_lband()
-
-    # Stochastic Oscillator
-    stochastic = ta.momentum.StochasticOscillator(
-        high=data['High'], 
-        low=data['Low'], 
-        close=data['Close'], 
-        window=14, 
-        smooth_window=3
+    # Tablas en orden cronológico; show_table las invierte al mostrarlas
+    return {
+        'metrics': calculate_metrics(data),
+        'figures': specs,
+        'prices': data[['Datetime', 'Open', 'High', 'Low', 'Close', 'Volume']],
+        'indicators': data[['Datetime'] + indicator_columns(indicators)] if indicators else None,
+    }
+
+
+# ============================
+# FUNCIÓN: Tabla paginada
+# ============================
+def show_table(frame, key, file_name):
+    """Muestra una página de ``frame``; filtro, orden y recorte se hacen en el servidor."""
+    columns = [column for column in frame.columns if column != 'Datetime']
+    col1, col2, col3, col4 = st.columns([2, 2, 1, 1])
+    first, last = frame['Datetime'].iloc[0].date(), frame['Datetime'].iloc[-1].date()
+    dates = col1.date_input('Fechas', (first, last), key=f'{key}_dates', format='DD/MM/YYYY')
+    sort_by = col2.selectbox('Ordenar por', ['Fecha'] + columns, key=f'{key}_sort')
+    descending = col3.toggle('Descendente', value=True, key=f'{key}_desc')
+    page_size = col4.selectbox('Filas', PAGE_SIZES, key=f'{key}_size')
+
+    # Mientras se elige el rango, date_input devuelve una sola fecha
+    start, end = (tuple(dates) + (None, None))[:2] if dates else (None, None)
+    rows = filter_dates(frame, start, end)
+    pages = page_count(len(rows), page_size)
+    page = st.number_input('Página', min_value=1, max_value=pages, value=1, key=f'{key}_page')
+    positions = page_positions(rows, min(page, pages) - 1, page_size,
+                               None if sort_by == 'Fecha' else sort_by, descending)
+
+    # Solo se formatean las fechas de las filas visibles
+    visible = rows.iloc[positions]
+    visible = visible[columns].assign(**{'Fecha': visible['Datetime'].dt.strftime('%d/%m/%Y')})
+    st.dataframe(
+        visible[['Fecha'] + columns],
+        width='stretch', #use_container_width=True
+        hide_index=True
     )
-    data['Stoch_%K'] = stochastic.stoch()
-    data['Stoch_%D'] = stochastic.stoch_signal()
+    st.caption(f"{len(rows)} filas · página {min(page, pages)} de {pages}")
+    # El CSV completo se genera recién al hacer clic
+    st.download_button(
+        'Descargar CSV',
+        data=lambda: csv_file(frame.rename(columns={'Datetime': 'Fecha'}), date_format='%d/%m/%Y'),
+        file_name=file_name, mime='text/csv', key=f'{key}_download', on_click='ignore'
+    )
+
 
-    return data
+# ============================
+# FUNCIÓN: Tiempos de la ejecución
+# ============================
+def report_timings(trace):
+    """Cierra el registro de tiempos y, con ``?debug=1`` en la URL, lo muestra.
+
+    Con el grabador de perfiles activo (core.profiling), guarda el perfil
+    de la ejecución si fue lenta.
+    """
+    finish_trace(trace)
+    if recorder is not None:
+        recorder.finish(trace.total, trace.context, trace.stages())
+    if st.query_params.get('debug') != '1':
+        return
+    with st.expander(':material/timer: Tiempos por etapa', expanded=True):
+        col1, col2 = st.columns(2)
+        col1.caption(f"Esta ejecución: {trace.total * 1000:.1f} ms")
+        spans = trace.timeline()
+        col1.dataframe(
+            pd.DataFrame({
+                # Sangría según el anidamiento (p. ej. red y csv dentro de historia);
+                # las descargas en paralelo se superponen
+                'Etapa': ['\u2003' * depth + name for name, depth, _, _ in spans],
+                'Inicio (ms)': [round(start * 1000, 1) for _, _, start, _ in spans],
+                'ms': [round(seconds * 1000, 1) for _, _, _, seconds in spans],
+            }),
+            hide_index=True, width='stretch'
+        )
+        percentiles = stats.percentiles()
+        col2.caption(f"Últimas {percentiles['total']['n']} ejecuciones del proceso (ms)")
+        col2.dataframe(
+            pd.DataFrame.from_dict(percentiles, orient='index').rename_axis('Etapa').reset_index(),
+            hide_index=True, width='stretch'
+        )
+        st.json(trace.context, expanded=False)
+
+    if recorder is not None:
+        show_profiles()
+
+
+def show_profiles():
+    """Perfiles guardados de las ejecuciones lentas, para descargar."""
+    profiles = recorder.profiles()
+    label = f':material/troubleshoot: Ejecuciones lentas (≥ {recorder.threshold * 1000:.0f} ms)'
+    with st.expander(label, expanded=False):
+        if not profiles:
+            st.caption("Todavía no hay perfiles guardados.")
+        for path, meta in profiles:
+            params = meta.get('parametros', {})
+            col1, col2 = st.columns([4, 1])
+            col1.markdown(
+                f"**{meta.get('total_ms', 0):.0f} ms** · {meta.get('momento', path.stem)} · "
+                f"{params.get('ticker', '-')} {params.get('periodo', '')} "
+                f"{', '.join(params.get('indicadores', []))}"
+            )
+            # El archivo se lee recién al hacer clic
+            col2.download_button(
+                '.prof', data=lambda path=path: path.read_bytes(), file_name=path.name,
+                mime='application/octet-stream', key=f'profile-{path.stem}', on_click='ignore'
+            )
+        if profiles:
+            st.caption("Funciones con más tiempo acumulado en la más reciente:")
+            st.code(profiles[0][1].get('resumen', ''), language=None)
 
 
 # ============================
@@ -122,109 +439,277 @@ st.markdown(hide_sidebar_style, unsafe_allow_html=True)
 st.set_page_config(page_title="Stock Dashboard", page_icon=":material/finance_mode:", layout="wide")
 st.title(':material/finance: Real Time Stock Dashboard')
 
+# Tiempos por etapa de esta ejecución (core.timing): van al log en JSON y,
+# con ?debug=1 en la URL, a un panel al final de la página
+trace = start_trace('app', sesion=st.session_state.setdefault('session_id', uuid.uuid4().hex[:8]))
+# Con STOCK_PROFILE_THRESHOLD_MS cada ejecución corre bajo cProfile (core.profiling)
+if recorder is not None:
+    recorder.begin()
+
 # ====== TARJETAS DE COTIZACIONES ======
 st.subheader("Cotizaciones rápidas del mercado")
 
 stock_symbols = ['AAPL', 'GOOGL', 'JPM', 'NVDA']
-cols = st.columns(4)
-
-for i, symbol in enumerate(stock_symbols):
-    symbol_stooq = symbol + '.US'
-    real_time_data = fetch_stock_data(symbol_stooq, '5d')
-    if not real_time_data.empty:
-        real_time_data = process_data(real_time_data)
-        last_price = round(real_time_data['Close'].iloc[-1], 2)
-        change = round(last_price - real_time_data['Open'].iloc[0], 2)
-        pct_change = round((change / real_time_data['Open'].iloc[0]) * 100, 2)
-        color = "green" if change > 0 else "red" if change < 0 else "gray"
-
-        with cols[i]:
-                st.markdown(
-                    f"""
-                        <div style="background-color:#1E362F;
-                            border:1px solid #555;
-                            padding:10px 10px; /* menos padding */
-                            border-radius:6px;
-                            text-align:center;
-                            width:100%;
-                            max-width:250px; /* más angosta */
-                            margin:auto;
-                            box-shadow:0px 0px 3px rgba(0,0,0,0.2);">
-                            <h4 style="margin-bottom:2px; font-size:14px;">{symbol}</h4>
-                            <h3 style="margin:0; font-size:16px;">${last_price}</h3>
-                            <p style="color:{color}; font-weight:600; margin-top:2px; font-size:12px;">
-                            {change:+.2f} ({pct_change:+.2f}%)
-                            </p>
-                        </div>
-                    """,
-                    unsafe_allow_html=True
-                )
-
-            
-            #st.markdown(
-            #    f"""
-            #"""    <div style="background-color:#1E362F;border:1px solid #DDD;padding:15px;
-            #                border-radius:10px;text-align:center;box-shadow:1px 1px 4px rgba(0,0,0,0.1);">
-            #        <h5 style="margin-bottom:5px;">{symbol}</h5>
-            #        <h4 style="margin:0;">${last_price}</h4>
-            #        <p style="color:{color};font-weight:bold;margin-top:5px;">
-            #            {change:+.2f} ({pct_change:+.2f}%)
-            #        </p>
-            #    </div>
-            #    """,
-            #    unsafe_allow_html=True
-            #    )
-            
+
+# Un hilo del proceso mantiene actualizadas estas historias (y las de
+# STOCK_REFRESH_TICKERS) para que la página encuentre la caché caliente
+refresher = start_scheduler([symbol + '.US' for symbol in stock_symbols])
+
+# Segundos entre redibujos de las tarjetas (STOCK_CARDS_REFRESH)
+CARDS_REFRESH = int(os.environ.get('STOCK_CARDS_REFRESH', 60))
+
+
+def quote_card(symbol, history):
+    """HTML de la tarjeta de ``symbol`` con las últimas 5 sesiones de ``history``."""
+    real_time_data = slice_period(history, '5d')
+    last_price = round(real_time_data['Close'].iloc[-1], 2)
+    change = round(last_price - real_time_data['Open'].iloc[0], 2)
+    pct_change = round((change / real_time_data['Open'].iloc[0]) * 100, 2)
+    color = "green" if change > 0 else "red" if change < 0 else "gray"
+
+    return f"""
+            <div style="background-color:#1E362F;
+                border:1px solid #555;
+                padding:10px 10px; /* menos padding */
+                border-radius:6px;
+                text-align:center;
+                width:100%;
+                max-width:250px; /* más angosta */
+                margin:auto;
+                box-shadow:0px 0px 3px rgba(0,0,0,0.2);">
+                <h4 style="margin-bottom:2px; font-size:14px;">{symbol}</h4>
+                <h3 style="margin:0; font-size:16px;">${last_price}</h3>
+                <p style="color:{color}; font-weight:600; margin-top:2px; font-size:12px;">
+                {change:+.2f} ({pct_change:+.2f}%)
+                </p>
+            </div>
+        """
+
+    #st.markdown(
+    #    f"""
+    #"""    <div style="background-color:#1E362F;border:1px solid #DDD;padding:15px;
+    #                border-radius:10px;text-align:center;box-shadow:1px 1px 4px rgba(0,0,0,0.1);">
+    #        <h5 style="margin-bottom:5px;">{symbol}</h5>
+    #        <h4 style="margin:0;">${last_price}</h4>
+    #        <p style="color:{color};font-weight:bold;margin-top:5px;">
+    #            {change:+.2f} ({pct_change:+.2f}%)
+    #        </p>
+    #    </div>
+    #    """,
+    #    unsafe_allow_html=True
+    #    )
+
+
+@st.fragment(run_every=CARDS_REFRESH)
+def quote_cards():
+    """Tarjetas en un fragmento: se redibujan solas cada ``CARDS_REFRESH`` segundos.
+
+    Ni el temporizador vuelve a ejecutar el resto de la página ni los demás
+    widgets rearman las tarjetas: el HTML de cada una se guarda en la sesión
+    con la versión de su historia y solo se rehace cuando la historia cambia.
+    """
+    cols = st.columns(4)
+    rendered = st.session_state.setdefault('quote_cards', {})
+
+    # Las cuatro historias se piden en paralelo; cada tarjeta se dibuja
+    # apenas llega la suya, sin esperar a las demás.
+    for symbol_stooq, history, error in fetch_many([symbol + '.US' for symbol in stock_symbols]):
+        symbol = symbol_stooq.removesuffix('.US')
+        i = stock_symbols.index(symbol)
+        if error is not None:
+            cols[i].error(f"Error al descargar datos para {symbol_stooq}: {error}")
+            continue
+        if history.empty:
+            cols[i].warning(f"No se encontraron datos para {symbol_stooq} en Stooq.")
+            continue
+
+        version = data_version(history)
+        if rendered.get(symbol, (None,))[0] != version:
+            rendered[symbol] = (version, quote_card(symbol, history))
+        cols[i].markdown(rendered[symbol][1], unsafe_allow_html=True)
+
+    if refresher is not None:
+        status = refresher.status()
+        if status['last_end'] is not None:
+            failed = [ticker for ticker, result in status['tickers'].items() if not result['ok']]
+            st.caption(
+                f"Actualización automática: {status['last_end']:%d/%m %H:%M} (hora de Nueva York)"
+                + (f" · próxima {status['next_run']:%d/%m %H:%M}" if status['next_run'] else "")
+                + (f" · con errores: {', '.join(failed)}" if failed else "")
+            )
+
+
+with span('tarjetas'):
+    quote_cards()
+
+
+# ====== COMPARACIÓN DE TICKERS ======
+@st.fragment
+def comparison():
+    """Rendimiento acumulado de hasta ``MAX_COMPARE`` tickers en un mismo gráfico.
+
+    Es un fragmento: comparar no vuelve a ejecutar el resto de la página.
+    Las historias se piden en paralelo y la figura se comparte entre
+    sesiones en ``view_cache`` con la versión de cada historia en la clave.
+    """
+    col1, col2, col3 = st.columns([3, 1, 1])
+    with col1:
+        symbols = st.text_input(
+            'Tickers a comparar (separados por coma)',
+            ', '.join(stock_symbols + ['AMD', 'MSFT']),
+            key='comparar_tickers'
+        )
+    with col2:
+        period = st.selectbox('Período', PERIODS, index=PERIODS.index('1y'), key='comparar_periodo')
+    with col3:
+        st.write("")
+        st.write("")
+        if st.button('Comparar', use_container_width=True, key='comparar'):
+            tickers = [symbol.strip().upper() for symbol in symbols.split(',') if symbol.strip()]
+            tickers = [ticker if ticker.endswith('.US') else ticker + '.US' for ticker in tickers]
+            st.session_state['compare_request'] = (tuple(dict.fromkeys(tickers)), period)
+
+    if 'compare_request' not in st.session_state:
+        return
+    tickers, period = st.session_state['compare_request']
+    if len(tickers) > MAX_COMPARE:
+        st.warning(f"Se comparan los primeros {MAX_COMPARE} de {len(tickers)} tickers.")
+        tickers = tickers[:MAX_COMPARE]
+
+    histories, missing = {}, []
+    for ticker, history, error in fetch_many(tickers):
+        if error is not None or history.empty:
+            missing.append(ticker)
+        else:
+            histories[ticker] = history
+    if missing:
+        st.warning(f"Sin datos para {', '.join(sorted(missing))}.")
+    # En el orden pedido (fetch_many los entrega a medida que terminan)
+    histories = {ticker.removesuffix('.US'): histories[ticker] for ticker in tickers if ticker in histories}
+
+    key = ('comparar', tuple(histories), period, datetime.now().date(),
+           tuple(data_version(history) for history in histories.values()))
+    view = view_cache.get(key)
+    if view is None:
+        view = build_comparison(histories, period)
+        if view is not None:
+            view_cache.set(key, view)
+    if view is None:
+        st.info("No hay datos para comparar en ese período.")
+        return
+
+    import plotly.graph_objects as go
+
+    st.plotly_chart(go.Figure(json.loads(view['figure']), _validate=False), config={"responsive": True})
+    st.dataframe(view['summary'], hide_index=True)
+
+
+with st.expander(':material/stacked_line_chart: Comparar rendimientos'):
+    with span('comparacion'):
+        comparison()
 
 st.divider()
 # ====== CONTROLES EN EL CUERPO PRINCIPAL ======
 st.subheader(":material/settings_applications: Parámetros del gráfico")
 
 with st.container(border=True):
-    col1, col2, col3 = st.columns([1, 1, 1])
+    col1, col2, col3, col4 = st.columns([1, 1, 1, 1])
 
     with col1:
-        ticker_input = st.text_input('Ticker', 'AMD').upper()
+        ticker_input = st.text_input('Ticker', 'AMD', key='ticker').upper()
         ticker = ticker_input + '.US' if not ticker_input.endswith('.US') else ticker_input
 
     with col2:
         time_period = st.selectbox(
             'Período de tiempo',
-            ['5d', '1mo', '3mo', '6mo', '1y', 'max']
+            PERIODS,
+            key='periodo'
         )
 
     with col3:
+        interval = st.selectbox(
+            'Intervalo',
+            list(INTERVAL_LABELS),
+            format_func=INTERVAL_LABELS.get,
+            key='intervalo'
+        )
+
+    with col4:
         chart_type = st.selectbox(
             'Tipo de gráfico',
-            ['Candlestick', 'Line']
+            ['Candlestick', 'Line'],
+            key='grafico'
         )
 
     col1, col2 = st.columns([3, 1])
     with col1:
         indicators = st.multiselect(
             'Indicadores técnicos',
-            ['SMA 20', 'EMA 20', 'RSI 14', 'MACD', 'Bollinger Bands', 'Stochastic Oscillator']
+            list(INDICATORS),
+            key='indicadores'
         )
 
     with col2:
         st.write("")  
         st.write("") 
-        actualizar = st.button('Actualizar', use_container_width=True)
+        actualizar = st.button('Actualizar', use_container_width=True, key='actualizar')
+
+    col1, col2 = st.columns(2)
+    with col1:
+        combined = st.toggle(
+            'Gráfico combinado',
+            value=True,
+            key='combinado',
+            help="Precio y osciladores en un solo gráfico WebGL con el eje de fechas compartido."
+        )
+    with col2:
+        full_resolution = st.toggle(
+            'Resolución completa',
+            key='resolucion_completa',
+            help=f"Sin reducir los gráficos a {POINT_BUDGET} puntos; útil para hacer zoom en períodos largos."
+        )
 
 # ====== LÓGICA PRINCIPAL ======
+# La vista queda en la sesión: paginar u ordenar las tablas vuelve a
+# ejecutar la página sin que haga falta apretar "Actualizar" de nuevo
 if actualizar:
-    data = fetch_stock_data(ticker, time_period)
-    data = process_data(data)
-    data = add_technical_indicators(data)
-
-    if data.empty:
+    st.session_state['view_request'] = (ticker, time_period, interval, chart_type,
+                                        tuple(indicators), full_resolution, combined)
+
+if 'view_request' in st.session_state:
+    ticker, time_period, interval, chart_type, indicators, full_resolution, combined = (
+        st.session_state['view_request'])
+    indicators = list(indicators)
+    trace.context.update(ticker=ticker, periodo=time_period, intervalo=interval,
+                         grafico=chart_type, indicadores=indicators,
+                         resolucion_completa=full_resolution, combinado=combined)
+    # La vista armada se comparte entre sesiones: la clave incluye la
+    # versión de la historia, así que una barra nueva la invalida sola
+    try:
+        with span('historia'):
+            version = history_version(ticker)
+    except Exception as e:
+        # Igual que fetch_stock_data: la falla del proveedor se muestra sin romper la página
+        st.error(f"Error al descargar datos para {ticker}: {e}")
+        report_timings(trace)
+        st.stop()
+    view_key = (ticker.upper(), time_period, interval, chart_type, tuple(sorted(indicators)),
+                full_resolution, combined, datetime.now().date(), version)
+    view = view_cache.get(view_key)
+    trace.context['vista_en_cache'] = view is not None
+    if view is None:
+        with span('vista'):
+            view = build_view(ticker, time_period, interval, chart_type, indicators,
+                              full_resolution, combined)
+        if view is not None:
+            view_cache.set(view_key, view)
+
+    if view is None:
         st.warning("No hay datos para mostrar.")
+        report_timings(trace)
         st.stop()
 
-    # Columna con fecha formateada para mostrar
-    data['Datetime_str'] = data['Datetime'].dt.strftime('%d/%m/%Y')
-
-    last_close, change, pct_change, high, low, volume = calculate_metrics(data)
+    last_close, change, pct_change, high, low, volume = view['metrics']
 
     # Mostrar métricas principales
     st.metric(
@@ -238,6 +723,29 @@ if actualizar:
     col2.metric("Mínimo", f"{low:.2f} USD")
     col3.metric("Volumen", f"{volume:,.0f}")
 
+    import plotly.graph_objects as go
+
+    # Las figuras se guardan validadas; al reconstruirlas no hace falta validar de nuevo
+    with span('graficos'):
+        for spec in view['figures']:
+            st.plotly_chart(go.Figure(json.loads(spec), _validate=False), config={"responsive": True})
+
+    # ====== TABLAS PAGINADAS (más reciente primero) ======
+    # Filtros y página se reinician con cada vista nueva
+    table_key = '-'.join(map(str, st.session_state['view_request']))
+    st.subheader(':material/database_search: Datos Históricos')
+    with span('tablas'):
+        show_table(view['prices'], f'prices-{table_key}', f'{ticker}_{time_period}_historico.csv')
+
+    st.subheader(':material/analytics: Indicadores Técnicos')
+    if view['indicators'] is not None:
+        with span('tablas'):
+            show_table(view['indicators'], f'indicators-{table_key}', f'{ticker}_{time_period}_indicadores.csv')
+    else:
+        st.info("Elegí indicadores técnicos para ver sus valores.")
+
+report_timings(trace)
+
 
 # ====== SIDEBAR ======
 #st.sidebar.header(':material/settings_applications: Parámetros del gráfico')
@@ -276,83 +784,3 @@ if actualizar:
 #    col1.metric("Máximo", f"{high:.2f} USD")
 #    col2.metric("Mínimo", f"{low:.2f} USD")
 #    col3.metric("Volumen", f"{volume:,.0f}")
-
-    # ====== GRÁFICO PRINCIPAL ======
-    fig = go.Figure()
-
-    if chart_type == 'Candlestick':
-        fig.add_trace(go.Candlestick(
-            x=data['Datetime'],
-            open=data['Open'],
-            high=data['High'],
-            low=data['Low'],
-            close=data['Close'],
-            name='Precio'
-        ))
-    else:
-        fig = px.line(data, x='Datetime', y='Close', title=f"{ticker} Price Chart")
-
-    # Añadir indicadores técnicos
-    for indicator in indicators:
-        if indicator == 'SMA 20':
-            fig.add_trace(go.Scatter(x=data['Datetime'], y=data['SMA_20'], name='SMA 20', line=dict(color='blue')))
-        elif indicator == 'EMA 20':
-            fig.add_trace(go.Scatter(x=data['Datetime'], y=data['EMA_20'], name='EMA 20', line=dict(color='orange')))
-        elif indicator == 'Bollinger Bands':
-            fig.add_trace(go.Scatter(x=data['Datetime'], y=data['BB_High'], name='BB Superior', line=dict(color='gray', dash='dot')))
-            fig.add_trace(go.Scatter(x=data['Datetime'], y=data['BB_Low'], name='BB Inferior', line=dict(color='gray', dash='dot')))
-
-    fig.update_layout(
-        title=f'{ticker} ({time_period})',
-        xaxis_title='Fecha',
-        yaxis_title='Precio (USD)',
-        height=600,
-        xaxis_rangeslider_visible=False
-    )
-
-    st.plotly_chart(fig, config={"responsive": True})
-
-    # ====== SUBGRÁFICOS RSI y MACD ======
-    if 'RSI 14' in indicators:
-        fig_rsi = px.line(data, x='Datetime', y='RSI_14', title='RSI (14)')
-        fig_rsi.add_hline(y=70, line_dash="dash", line_color="red")
-        fig_rsi.add_hline(y=30, line_dash="dash", line_color="green")
-        st.plotly_chart(fig_rsi, config={"responsive": True})
-
-    if 'MACD' in indicators:
-        fig_macd = go.Figure()
-        fig_macd.add_trace(go.Scatter(x=data['Datetime'], y=data['MACD'], name='MACD', line=dict(color='blue')))
-        fig_macd.add_trace(go.Scatter(x=data['Datetime'], y=data['MACD_Signal'], name='Señal', line=dict(color='orange')))
-        fig_macd.add_trace(go.Bar(x=data['Datetime'], y=data['MACD_Hist'], name='Histograma', marker_color='gray'))
-        fig_macd.update_layout(title='MACD', height=300)
-        st.plotly_chart(fig_macd, config={"responsive": True})
-
-    # ====== SUBGRÁFICO STOCHASTIC OSCILLATOR ======
-    if 'Stochastic Oscillator' in indicators:
-        fig_stoch = go.Figure()
-        fig_stoch.add_trace(go.Scatter(
-            x=data['Datetime'], y=data['Stoch_%K'], name='%K', line=dict(color='blue')
-        ))
-        fig_stoch.add_trace(go.Scatter(
-            x=data['Datetime'], y=data['Stoch_%D'], name='%D', line=dict(color='orange')
-        ))
-        fig_stoch.add_hline(y=80, line_dash="dash", line_color="red")
-        fig_stoch.add_hline(y=20, line_dash="dash", line_color="green")
-        fig_stoch.update_layout(title='Stochastic Oscillator', height=300)
-        st.plotly_chart(fig_stoch, config={"responsive": True})
-
-    # ====== TABLAS ORDENADAS (más reciente primero) ======
-    data_sorted = data.sort_values(by='Datetime', ascending=False)
-
-    st.subheader(':material/database_search: Datos Históricos')
-    st.dataframe(
-        data_sorted[['Datetime_str', 'Open', 'High', 'Low', 'Close', 'Volume']],
-        width='stretch' #use_container_width=True
-    )
-
-    st.subheader(':material/analytics: Indicadores Técnicos')
-    st.dataframe(
-        data_sorted[['Datetime_str', 'SMA_20', 'EMA_20', 'RSI_14', 'MACD',
-                     'MACD_Signal', 'BB_High', 'BB_Low', 'Stoch_%K', 'Stoch_%D']],
-        width='stretch' #use_container_width=True
-    )
@@ -0,0 +1,18 @@
+"""Punto de entrada del servidor con static serving y caché del navegador.
+
+    streamlit run serve.py
+
+Sirve la misma app que ``streamlit run main.py``, pero activa
+``server.enableStaticServing`` y agrega ``core.assets.StaticCacheMiddleware``:
+la intro carga sus archivos desde ``/app/static/`` con URL versionadas y las
+visitas siguientes los toman de la caché del navegador.
+"""
+import streamlit as st
+from starlette.middleware import Middleware
+from streamlit import config
+
+from core.assets import StaticCacheMiddleware
+
+config.set_option('server.enableStaticServing', True)
+
+app = st.App('main.py', middleware=[Middleware(StaticCacheMiddleware)])
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Las pruebas importan ``core`` desde la raíz del repositorio, como la página
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
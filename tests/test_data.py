@@ -0,0 +1,92 @@
+"""Recorte de períodos (``core.periods``), velas por período y la historia compartida de ``core.data``."""
+import os
+
+import pandas as pd
+import pytest
+
+# Datos sintéticos, sin almacén en disco ni planificador: antes de importar core.data
+os.environ['STOCK_DATA_PROVIDER'] = 'synthetic'
+os.environ['STOCK_STORE_DIR'] = ''
+os.environ['STOCK_TIMING_LOG'] = ''
+os.environ['STOCK_REFRESH_INTERVAL'] = '0'
+
+from core import data, periods  # noqa: E402
+from core.providers import synthetic_ohlcv  # noqa: E402
+
+APP = os.path.join(os.path.dirname(__file__), '..', 'pages', 'app.py')
+
+
+# ============================
+# PRUEBAS: since / slice_period
+# ============================
+@pytest.mark.parametrize('period', ['1mo', '3mo', '1y'])
+def test_slice_period_on_seconds_index(period):
+    # Los CSV de Stooq se leen con índice datetime64[s]; ``now`` trae microsegundos
+    history = synthetic_ohlcv(600, start='2023-01-02')
+    seconds = history.set_axis(history.index.as_unit('s'))
+    now = pd.Timestamp('2025-02-14 13:45:12.123456')
+
+    sliced = periods.slice_period(seconds, period, now)
+    expected = periods.slice_period(history, period, now)
+    assert str(sliced.index.dtype) == 'datetime64[s]'
+    pd.testing.assert_index_equal(sliced.index, expected.index.as_unit('s'))
+    start = now - pd.Timedelta(days=periods.PERIOD_DAYS[period])
+    assert sliced.index[0] >= start and seconds.index[len(seconds) - len(sliced) - 1] < start
+
+
+def test_since_on_seconds_index_includes_start():
+    history = synthetic_ohlcv(30, start='2024-03-01')
+    seconds = history.set_axis(history.index.as_unit('s'))
+    assert periods.since(seconds, '2024-03-05').index[0] == pd.Timestamp('2024-03-05')
+    assert periods.since(seconds, pd.Timestamp('2024-03-04 00:00:00.5')).index[0] == pd.Timestamp('2024-03-05')
+
+
+def test_five_days_across_weekend():
+    # Del martes al lunes siguiente: "5d" son sesiones, no días calendario
+    history = synthetic_ohlcv(30, start='2024-03-01')
+    monday = pd.Timestamp('2024-03-18')
+    sliced = periods.slice_period(history.loc[:monday], '5d', now=monday)
+    assert list(sliced.index) == list(pd.bdate_range('2024-03-12', monday))
+
+
+# ============================
+# PRUEBAS: get_period_bars
+# ============================
+def test_period_bars_slice_before_grouping():
+    history = data.get_history('AMD.US')
+    daily = history.iloc[-5:]
+    bars = data.get_period_bars('AMD.US', '5d', '3mo')
+
+    # Una vela trimestral (dos si las sesiones cruzan el cambio de trimestre)
+    assert 1 <= len(bars) <= 2
+    assert bars['Open'].iloc[0] == daily['Open'].iloc[0]
+    assert bars['Close'].iloc[-1] == daily['Close'].iloc[-1]
+    assert bars['High'].max() == daily['High'].max()
+    assert bars['Low'].min() == daily['Low'].min()
+    assert bars['Volume'].sum() == daily['Volume'].sum()
+
+
+@pytest.mark.parametrize('interval', ['1d', '1wk', '3mo'])
+def test_indicators_of_empty_history(monkeypatch, interval):
+    monkeypatch.setattr(data, 'get_history', lambda ticker: pd.DataFrame())
+    assert data.get_indicators('NADA.US', ['RSI 14'], interval).empty
+
+
+# ============================
+# PRUEBAS: process_data en la página
+# ============================
+def test_page_leaves_cached_history_untouched():
+    from streamlit.testing.v1 import AppTest
+
+    history = data.get_history('AMD.US')
+    before = history.copy()
+
+    app = AppTest.from_file(APP, default_timeout=120).run()
+    app.selectbox(key='periodo').select('max')
+    app.button(key='actualizar').click().run()
+    assert not app.exception
+
+    cached = data.get_history('AMD.US')
+    assert cached is history
+    pd.testing.assert_frame_equal(cached, before)
+    assert cached.index.name == 'Date'
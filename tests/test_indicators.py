@@ -0,0 +1,118 @@
+"""Paridad de los indicadores con ``ta``: página, panel y cálculo barra a barra."""
+import numpy as np
+import pandas as pd
+import pytest
+import ta
+
+from core.indicators import INDICATORS, add_technical_indicators, compute_panel, indicator_columns
+from core.providers import synthetic_ohlcv
+from core.streaming import IndicatorStream
+
+RTOL = 1e-7
+ATOL = 1e-9
+
+
+def with_ta(data):
+    close = data['Close']
+    macd = ta.trend.MACD(close)
+    boll = ta.volatility.BollingerBands(close, window=20, window_dev=2)
+    stoch = ta.momentum.StochasticOscillator(data['High'], data['Low'], close,
+                                             window=14, smooth_window=3)
+    return pd.DataFrame({
+        'SMA_20': ta.trend.sma_indicator(close, window=20),
+        'EMA_20': ta.trend.ema_indicator(close, window=20),
+        'RSI_14': ta.momentum.rsi(close, window=14),
+        'MACD': macd.macd(),
+        'MACD_Signal': macd.macd_signal(),
+        'MACD_Hist': macd.macd_diff(),
+        'BB_High': boll.bollinger_hband(),
+        'BB_Low': boll.bollinger_lband(),
+        'Stoch_%K': stoch.stoch(),
+        'Stoch_%D': stoch.stoch_signal(),
+    }, index=data.index)
+
+
+def page_indicators(data, selected=None):
+    """Indicadores por el mismo camino que la página."""
+    return add_technical_indicators(data[['High', 'Low', 'Close']].copy(), selected)
+
+
+def assert_matches(expected, actual, columns=None):
+    for column in columns or expected.columns:
+        reference = expected[column].to_numpy(dtype=float)
+        values = np.asarray(actual[column], dtype=float)
+        np.testing.assert_array_equal(np.isnan(values), np.isnan(reference),
+                                      err_msg=f'{column}: NaN en posiciones distintas')
+        np.testing.assert_allclose(values, reference, rtol=RTOL, atol=ATOL, equal_nan=True,
+                                   err_msg=column)
+
+
+# ============================
+# PRUEBAS: add_technical_indicators
+# ============================
+@pytest.mark.parametrize('rows', [1, 5, 20, 40, 3_000, 200_000])
+def test_all_indicators_match_ta(rows):
+    data = synthetic_ohlcv(rows, seed=rows)
+    assert_matches(with_ta(data), page_indicators(data))
+
+
+@pytest.mark.parametrize('name', list(INDICATORS))
+def test_each_indicator_alone_matches_ta(name):
+    # Las Bandas de Bollinger calculan su SMA 20 como dependencia
+    data = synthetic_ohlcv(500, seed=3)
+    assert_matches(with_ta(data), page_indicators(data, [name]), indicator_columns([name]))
+
+
+@pytest.mark.parametrize('missing', [[250], [250, 251, 252], [499]])
+def test_missing_close_matches_ta(missing):
+    data = synthetic_ohlcv(500, seed=5)
+    data.iloc[missing, data.columns.get_loc('Close')] = np.nan
+    assert_matches(with_ta(data), page_indicators(data))
+
+
+# ============================
+# PRUEBAS: Panel de varios tickers
+# ============================
+def test_panel_shorter_history_matches_ta():
+    data = synthetic_ohlcv(1_000, seed=7)
+    late = data.copy()
+    late.iloc[:300] = np.nan
+    panel = compute_panel({column: np.column_stack([data[column], late[column]])
+                           for column in ('High', 'Low', 'Close')})
+
+    assert_matches(with_ta(data), {column: values[:, 0] for column, values in panel.items()},
+                   indicator_columns())
+    assert_matches(with_ta(data.iloc[300:]),
+                   {column: values[300:, 1] for column, values in panel.items()},
+                   indicator_columns())
+    assert all(np.isnan(values[:300, 1]).all() for values in panel.values())
+
+
+# ============================
+# PRUEBAS: Cálculo barra a barra (core.streaming)
+# ============================
+@pytest.mark.parametrize('seeded, missing', [
+    (1, []), (30, []), (400, []),
+    # Cierres faltantes en las barras nuevas y en la historia inicial
+    (400, [450]), (400, [450, 451, 599]), (400, [200, 450]), (30, [29, 30]),
+])
+def test_stream_matches_full_history(seeded, missing):
+    data = synthetic_ohlcv(600, seed=11)
+    data.iloc[missing, data.columns.get_loc('Close')] = np.nan
+    names = list(INDICATORS)
+    stream = IndicatorStream.from_history(data.iloc[:seeded], names)
+    rows = stream.extend(data.iloc[seeded:])
+
+    expected = page_indicators(data).iloc[seeded:]
+    assert_matches(expected, rows, indicator_columns(names))
+
+
+def test_stream_survives_serialization():
+    data = synthetic_ohlcv(300, seed=13)
+    names = list(INDICATORS)
+    stream = IndicatorStream.from_history(data.iloc[:200], names)
+    restored = IndicatorStream.from_dict(stream.to_dict())
+    assert restored.new_bars(data) is not None
+
+    expected = page_indicators(data).iloc[200:]
+    assert_matches(expected, restored.extend(restored.new_bars(data)), indicator_columns(names))
@@ -0,0 +1,69 @@
+"""Sincronización incremental del almacén en disco (``core.store``)."""
+import pandas as pd
+
+from core.providers import CSVDirectoryProvider, synthetic_ohlcv
+from core.store import OHLCVStore
+
+
+def fetcher(source, calls):
+    """``fetch(ticker, start)`` sobre ``source`` que anota cada ``start`` pedido."""
+    def fetch(ticker, start):
+        calls.append(start)
+        return source if start is None else source[source.index >= start]
+    return fetch
+
+
+def test_sync_creates_appends_and_takes_corrections(tmp_path):
+    store = OHLCVStore(tmp_path)
+    source = synthetic_ohlcv(300, seed=1)
+    calls = []
+
+    # Sin nada guardado: descarga todo y lo guarda
+    first = store.sync('AAA', fetcher(source.iloc[:250], calls))
+    assert calls == [None]
+    pd.testing.assert_frame_equal(first, source.iloc[:250])
+    assert len(store.parts('AAA')) == 1
+
+    # Cola nueva y una barra corregida dentro del solapamiento
+    source.iloc[248, source.columns.get_loc('Close')] += 1.0
+    second = store.sync('AAA', fetcher(source, calls), overlap_days=7)
+    assert calls[-1] == source.index[249] - pd.Timedelta(days=7)
+    pd.testing.assert_frame_equal(second, source, check_freq=False)
+    pd.testing.assert_frame_equal(store.read('AAA'), source, check_freq=False)
+    # La parte nueva solo tiene la barra corregida y las 50 nuevas
+    assert len(pd.read_parquet(store.parts('AAA')[-1])) == 51
+
+    # Sin cambios no se escribe nada
+    store.sync('AAA', fetcher(source, calls))
+    assert len(store.parts('AAA')) == 2
+
+
+def test_sync_keeps_stored_history_when_fetch_fails(tmp_path):
+    store = OHLCVStore(tmp_path)
+    source = synthetic_ohlcv(100, seed=2)
+    store.sync('AAA', fetcher(source, []))
+
+    def broken(ticker, start):
+        raise OSError('sin red')
+
+    pd.testing.assert_frame_equal(store.sync('AAA', broken), source, check_freq=False)
+
+
+def test_sync_csv_without_volume(tmp_path):
+    folder = tmp_path / 'csv'
+    folder.mkdir()
+    source = synthetic_ohlcv(120, seed=3).drop(columns='Volume')
+    path = folder / 'aaa.csv'
+    source.iloc[:100].to_csv(path, index_label='Date')
+    provider = CSVDirectoryProvider(folder)
+    store = OHLCVStore(tmp_path / 'store')
+
+    first = store.sync('AAA', provider.fetch)
+    assert list(first.columns) == ['Open', 'High', 'Low', 'Close']
+
+    source.iloc[98, source.columns.get_loc('Open')] += 0.5
+    source.to_csv(path, index_label='Date')
+    merged = store.sync('AAA', provider.fetch)
+    assert len(merged) == 120
+    assert merged['Open'].iloc[98] == source['Open'].iloc[98]
+    pd.testing.assert_frame_equal(store.read('AAA'), merged)